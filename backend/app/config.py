@@ -1,26 +1,100 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Literal
 import os
 
 
 class Settings(BaseSettings):
     # Database - defaults to SQLite for local dev, use DATABASE_URL env var for PostgreSQL
     DATABASE_URL: str = "sqlite+aiosqlite:///./medbrief.db"
+    SQL_ECHO: bool = False  # Log every SQL statement (debugging only; slows requests)
+
+    # Startup schema handling: "check" skips table creation and upgrades when the
+    # database's schema stamp matches the models; "sync" always reflects and upgrades
+    SCHEMA_STARTUP_MODE: Literal["check", "sync"] = "check"
+
+    # Connection pool (server databases; SQLite uses its own file-backed pool)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE_SECONDS: int = 1800  # Replace connections before the server or a proxy drops them
+    DB_POOL_PRE_PING: bool = True
+
+    # SQLite - WAL lets reads proceed during a write; NORMAL sync is durable across app crashes
+    SQLITE_WAL: bool = True
+    SQLITE_SYNCHRONOUS: Literal["OFF", "NORMAL", "FULL", "EXTRA"] = "NORMAL"
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+
+    # Logging
+    LOG_LEVEL: str = "INFO"
 
     # JWT
     SECRET_KEY: str = "CHANGE_ME_IN_PRODUCTION"
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24  # 1 day
 
+    # Authenticated-user cache; with AUTH_TRUST_TOKEN_CLAIMS the user is taken from
+    # the signed token without a database lookup (deleted users keep access until expiry)
+    AUTH_PRINCIPAL_CACHE_SIZE: int = 10_000
+    AUTH_PRINCIPAL_CACHE_TTL_SECONDS: int = 300
+    AUTH_TRUST_TOKEN_CLAIMS: bool = False
+
+    # Password hashing - bcrypt cost and how many hashes may run at once
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2
+
     # CORS - allow all origins in production (Railway provides random URLs)
     CORS_ORIGINS: List[str] = ["http://localhost:5173", "http://localhost:8000"]
 
     # PubMed
     PUBMED_EMAIL: str = "your_email@example.com"  # Required by NCBI
+    NCBI_API_KEY: str = ""  # Optional; raises the E-utilities limit from 3 to 10 requests/sec
+    # SQLite file the worker processes book E-utilities slots in, so together they
+    # stay within the limit above; empty limits each process on its own
+    NCBI_RATE_LIMIT_PATH: str = "./ncbi_rate_limit.db"
+    NCBI_EUTILS_BASE_URL: str = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/"  # Point at a stub server for testing
+    # Requests/sec override (e.g. against a stub server); 0 = NCBI's limit for the key. The limit is
+    # shared by all worker processes through NCBI_RATE_LIMIT_PATH; with that disabled, each worker
+    # applies it on its own, so divide it by the worker count.
+    NCBI_RATE_LIMIT: float = 0
+    NCBI_HTTP2: bool = True
+    NCBI_MAX_CONNECTIONS: int = 10
+    NCBI_CONNECT_TIMEOUT: float = 5.0
+    NCBI_READ_TIMEOUT: float = 60.0
+    PUBMED_MAX_ARTICLES: int = 2000  # Cap per search and per brief; briefs beyond it are flagged truncated
+
+    # Article store - how long a journal's latest sync counts as fresh, and how many
+    # recent days are re-fetched once it goes stale (PubMed backfills recent dates)
+    ARTICLE_SYNC_TTL_MINUTES: int = 60
+    ARTICLE_SYNC_OVERLAP_DAYS: int = 3
+
+    # Shared PubMed result cache (per process)
+    PUBMED_CACHE_TTL_SECONDS: int = 600
+    PUBMED_CACHE_MAX_ENTRIES: int = 512
+    PUBMED_CACHE_MAX_ARTICLES: int = 50_000
+
+    # PubMed result cache shared by all worker processes on the host (SQLite file; "" disables).
+    # A worker fetching a key holds a lease on it so the others wait for its result.
+    PUBMED_SHARED_CACHE_PATH: str = "./pubmed_cache.db"
+    PUBMED_SHARED_CACHE_MAX_MB: int = 256
+    PUBMED_SHARED_CACHE_LEASE_SECONDS: float = 120.0
+
+    # Journal autocomplete index - rebuilt in the background once older than this
+    JOURNAL_INDEX_REFRESH_SECONDS: int = 300
+
+    # Brief snapshots backing cursor pagination (per process)
+    BRIEF_SNAPSHOT_TTL_SECONDS: int = 900
+    BRIEF_SNAPSHOT_MAX_ENTRIES: int = 1000
+    BRIEF_SNAPSHOT_MAX_ARTICLES: int = 200_000
 
     class Config:
         env_file = ".env"
 
+    def get_ncbi_rate_limit(self) -> float:
+        """Requests per second NCBI allows for our key (or lack of one)."""
+        if self.NCBI_RATE_LIMIT > 0:
+            return self.NCBI_RATE_LIMIT
+        return 10.0 if self.NCBI_API_KEY else 3.0
+
     def get_database_url(self) -> str:
         """Convert DATABASE_URL to async format for SQLAlchemy."""
         db_url = self.DATABASE_URL
@@ -1,3 +1,4 @@
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession
 from sqlalchemy.orm import sessionmaker, declarative_base
 
@@ -6,7 +7,34 @@ from app.config import settings
 # Use the method that handles postgres:// -> postgresql+asyncpg:// conversion
 DATABASE_URL = settings.get_database_url()
 
-engine = create_async_engine(DATABASE_URL, echo=True)
+
+
+def _engine_options(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {}
+    return {
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE_SECONDS,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+
+
+engine = create_async_engine(DATABASE_URL, echo=settings.SQL_ECHO, **_engine_options(DATABASE_URL))
+
+
+@event.listens_for(engine.sync_engine, "connect")
+def _configure_sqlite(dbapi_connection, connection_record):
+    """Per-connection SQLite pragmas: WAL journal, sync level and a busy timeout instead of 'database is locked'."""
+    if engine.dialect.name != "sqlite":
+        return
+    cursor = dbapi_connection.cursor()
+    if settings.SQLITE_WAL:
+        cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+    cursor.close()
 
 async_session = sessionmaker(
     engine, class_=AsyncSession, expire_on_commit=False
@@ -19,3 +47,12 @@ async def get_db():
     async with async_session() as session:
         yield session
 
+
+
+def dialect_insert(table):
+    """Return an INSERT for the active dialect that supports ON CONFLICT clauses."""
+    if engine.dialect.name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        from sqlalchemy.dialects.sqlite import insert
+    return insert(table)
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Table
+from datetime import datetime
+
+from sqlalchemy import Column, Integer, String, Text, Boolean, Date, DateTime, Float, JSON, LargeBinary, ForeignKey, Index, Table, func
 from sqlalchemy.orm import relationship
 
 from app.database import Base
@@ -9,6 +11,17 @@ profile_journals = Table(
     Base.metadata,
     Column("profile_id", Integer, ForeignKey("profiles.id"), primary_key=True),
     Column("journal_id", Integer, ForeignKey("journals.id"), primary_key=True),
+    # The primary key leads with profile_id; this serves lookups from the journal side
+    Index("ix_profile_journals_journal_id", "journal_id"),
+)
+
+# Association table for Article <-> Journal (many-to-many)
+# journal_id leads the primary key so brief queries can range-scan by journal.
+article_journals = Table(
+    "article_journals",
+    Base.metadata,
+    Column("journal_id", Integer, ForeignKey("journals.id"), primary_key=True),
+    Column("article_pmid", Integer, ForeignKey("articles.pmid"), primary_key=True),
 )
 
 
@@ -27,7 +40,10 @@ class Profile(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False, default="My Brief")
-    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    # High-water mark of the last brief served: newest PMID and the day it was served
+    brief_mark_pmid = Column(Integer)
+    brief_marked_on = Column(Date)
 
     user = relationship("User", back_populates="profiles")
     journals = relationship("Journal", secondary=profile_journals, back_populates="profiles")
@@ -38,8 +54,54 @@ class Journal(Base):
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String, nullable=False)
-    issn = Column(String, unique=True, index=True)
+    issn = Column(String, unique=True, index=True)  # Print ISSN, or the electronic one if there is none
+    eissn = Column(String, index=True)  # Electronic ISSN, from the NLM catalog
     iso_abbreviation = Column(String)
     category = Column(String)  # e.g., "Cardiology", "Medicine"
 
     profiles = relationship("Profile", secondary=profile_journals, back_populates="journals")
+    articles = relationship("Article", secondary=article_journals, back_populates="journals")
+
+    # Case-insensitive preset lookups filter on lower(category)
+    __table_args__ = (Index("ix_journals_category_lower", func.lower(category)),)
+
+
+class Article(Base):
+    """A PubMed article stored locally so briefs can be served without NCBI round-trips."""
+    __tablename__ = "articles"
+
+    pmid = Column(Integer, primary_key=True, autoincrement=False)
+    title = Column(Text, nullable=False, default="")
+    authors = Column(JSON, nullable=False, default=list)
+    journal = Column(String, nullable=False, default="")
+    pub_date = Column(String, nullable=False, default="")  # As shown to users, e.g. "2025-Jan-05"
+    published_on = Column(Date, index=True)  # Sortable date used for brief date windows
+    abstract = Column(Text)
+    doi = Column(String)
+    fetched_at = Column(DateTime, default=datetime.utcnow)
+    # Ranking features kept from the PubMed record (see app.services.ranking)
+    publication_types = Column(JSON)
+    mesh_major = Column(JSON)
+
+    journals = relationship("Journal", secondary=article_journals, back_populates="articles")
+
+
+class JournalSync(Base):
+    """Contiguous date range already fetched from PubMed for one ISSN."""
+    __tablename__ = "journal_syncs"
+
+    issn = Column(String, primary_key=True)
+    synced_from = Column(Date, nullable=False)
+    synced_through = Column(Date, nullable=False)
+    synced_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class StoredSnapshot(Base):
+    """A paged brief, kept in the database so every worker can serve its cursors."""
+    __tablename__ = "brief_snapshots"
+
+    id = Column(String, primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    truncated = Column(Boolean, nullable=False, default=False)
+    articles = Column(LargeBinary, nullable=False)  # zlib-compressed JSON list
+    expires_at = Column(Float, nullable=False, index=True)  # Unix time
@@ -3,20 +3,48 @@ from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from pydantic import BaseModel, EmailStr
-from passlib.context import CryptContext
-from jose import jwt
+from dataclasses import dataclass
 from datetime import datetime, timedelta
+from sqlalchemy import event
 
 from app.database import get_db
 from app.models import User
 from app.config import settings
+from app.services.cache import TTLCache
+from app.services.metrics import StatsGauge, span
+from app.services.passwords import hash_password, verify_password
 
 router = APIRouter()
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 
+@dataclass(frozen=True)
+class Principal:
+    """The authenticated user, as needed by request handlers."""
+    id: int
+    email: str
+
+
+# Authenticated users by token subject, so most requests skip the user lookup.
+# Per process: changes made through another worker show up once entries expire.
+_principal_cache = TTLCache(
+    max_entries=settings.AUTH_PRINCIPAL_CACHE_SIZE,
+    ttl=settings.AUTH_PRINCIPAL_CACHE_TTL_SECONDS,
+)
+StatsGauge("medbrief_principal_cache", "Authenticated principal cache counters", _principal_cache.stats)
+
+
+def invalidate_principal(user_id: int) -> None:
+    _principal_cache.pop(str(user_id))
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _invalidate_changed_user(mapper, connection, target: User) -> None:
+    invalidate_principal(target.id)
+
+
 class UserCreate(BaseModel):
     email: EmailStr
     password: str
@@ -28,6 +56,8 @@ class Token(BaseModel):
 
 
 def create_access_token(data: dict) -> str:
+    from jose import jwt  # Imported on first use: its crypto backends are slow to load
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
@@ -42,13 +72,13 @@ async def register(user: UserCreate, db: AsyncSession = Depends(get_db)):
         raise HTTPException(status_code=400, detail="Email already registered")
 
     # Create user
-    hashed_password = pwd_context.hash(user.password)
+    hashed_password = await hash_password(user.password)
     db_user = User(email=user.email, password_hash=hashed_password)
     db.add(db_user)
     await db.commit()
     await db.refresh(db_user)
 
-    token = create_access_token({"sub": str(db_user.id)})
+    token = create_access_token({"sub": str(db_user.id), "email": db_user.email})
     return Token(access_token=token)
 
 
@@ -57,22 +87,48 @@ async def login(form: OAuth2PasswordRequestForm = Depends(), db: AsyncSession =
     result = await db.execute(select(User).where(User.email == form.username))
     user = result.scalar_one_or_none()
 
-    if not user or not pwd_context.verify(form.password, user.password_hash):
+    if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
 
-    token = create_access_token({"sub": str(user.id)})
+    valid, new_hash = await verify_password(form.password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # Stored hash predates the current bcrypt cost
+        user.password_hash = new_hash
+        await db.commit()
+
+    token = create_access_token({"sub": str(user.id), "email": user.email})
     return Token(access_token=token)
 
 
-async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> User:
+async def get_current_user(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_db)) -> Principal:
+    with span("auth"):
+        return await _authenticate(token, db)
+
+
+async def _authenticate(token: str, db: AsyncSession) -> Principal:
+    from jose import jwt
+
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        user_id = int(payload.get("sub"))
+        subject = payload.get("sub")
+        user_id = int(subject)
     except Exception:
         raise HTTPException(status_code=401, detail="Invalid token")
 
-    result = await db.execute(select(User).where(User.id == user_id))
-    user = result.scalar_one_or_none()
-    if not user:
+    if settings.AUTH_TRUST_TOKEN_CLAIMS:
+        # The signature is proof enough; skip the database entirely
+        return Principal(id=user_id, email=payload.get("email", ""))
+
+    principal = _principal_cache.get(subject)
+    if principal is not None:
+        return principal
+
+    result = await db.execute(select(User.id, User.email).where(User.id == user_id))
+    row = result.one_or_none()
+    if not row:
         raise HTTPException(status_code=401, detail="User not found")
-    return user
+    principal = Principal(id=row.id, email=row.email)
+    _principal_cache.set(subject, principal)
+    return principal
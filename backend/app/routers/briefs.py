@@ -1,18 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
-from pydantic import BaseModel
-from typing import List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, List, Literal, Optional, Tuple
 from datetime import date, timedelta
+import hashlib
 
-from app.database import get_db
-from app.models import Profile, User
-from app.routers.auth import get_current_user
-from app.services.pubmed import fetch_articles_for_journals
+from app.config import settings
+from app.database import async_session, get_db
+from app.models import Profile
+from app.routers.auth import Principal, get_current_user
+from app.services.article_store import (
+    SyncReport,
+    article_journal_ids,
+    brief_version,
+    iter_sync_journals,
+    query_articles,
+    query_articles_for_groups,
+    sync_journals,
+)
+from app.services.clock import today
+from app.services.search import search_articles
+from app.services.metrics import BRIEF_ARTICLES, span
+from app.services.ranking import DEFAULT_JOURNAL_WEIGHT, journal_weights, rank_articles
+from app.services.records import ArticleRecord
+from app.services.serialization import dumps
+from app.services.snapshots import BriefSnapshot, create_snapshot, decode_cursor, encode_cursor, get_snapshot
 
 router = APIRouter()
 
+# Page size when a cursor is followed without an explicit limit
+DEFAULT_PAGE_SIZE = 50
+
 
 class ArticleOut(BaseModel):
     pmid: str
@@ -25,41 +46,325 @@ class ArticleOut(BaseModel):
     pubmed_url: str
 
 
+def _json_response(content, headers: Optional[Dict[str, str]] = None) -> Response:
+    """
+    Encode article data ourselves; response_model would re-validate every article
+    against ArticleOut, which ArticleRecord.to_dict already guarantees.
+    """
+    with span("serialize"):
+        body = dumps(content)
+    return Response(body, media_type="application/json", headers=headers)
+
+
+async def _load_profile(db: AsyncSession, profile_id: int, user: Principal) -> Profile:
+    with span("profile_load"):
+        result = await db.execute(
+            select(Profile)
+            .options(selectinload(Profile.journals))
+            .where(Profile.id == profile_id, Profile.user_id == user.id)
+        )
+    profile = result.scalar_one_or_none()
+    if not profile:
+        raise HTTPException(status_code=404, detail="Profile not found")
+    return profile
+
+
+def _resolve_window(days: int, from_date: Optional[str], to_date: Optional[str]) -> Tuple[date, date]:
+    # Use explicit dates if provided, otherwise calculate from days
+    if from_date and to_date:
+        try:
+            return date.fromisoformat(from_date), date.fromisoformat(to_date)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    end_date = today()
+    return end_date - timedelta(days=days), end_date
+
+
 @router.get("/generate", response_model=List[ArticleOut])
 async def generate_brief(
-    profile_id: int,
+    profile_id: Optional[int] = None,
     days: int = Query(default=7, ge=1, le=90),
     from_date: Optional[str] = Query(default=None, description="Start date in YYYY-MM-DD format"),
     to_date: Optional[str] = Query(default=None, description="End date in YYYY-MM-DD format"),
-    current_user: User = Depends(get_current_user),
+    limit: Optional[int] = Query(default=None, ge=1, le=500, description="Page size; enables cursor pagination"),
+    cursor: Optional[str] = Query(default=None, description="X-Next-Cursor value from the previous page"),
+    since: Optional[str] = Query(
+        default=None,
+        description="X-Brief-Mark of an earlier brief, or 'last' for the profile's stored mark; only newer articles are returned",
+    ),
+    sort: Literal["date", "signal"] = Query(
+        default="date",
+        description="'date': newest first; 'signal': by evidence level, MeSH major topics, abstract, journal and recency",
+    ),
+    if_none_match: Optional[str] = Header(default=None),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Generate a brief for the given profile. Uses from_date/to_date if provided, otherwise last N days.
+    Sets X-Brief-Truncated: true when more articles matched than PUBMED_MAX_ARTICLES.
+
+    With `limit`, the brief is kept as a short-lived snapshot and only the first page is
+    returned; X-Next-Cursor (when present) fetches the next page from the snapshot via
+    `cursor`, without regenerating the brief. X-Brief-Total gives the snapshot size.
+
+    Unpaged responses carry an ETag (304 for a matching If-None-Match, without loading
+    the articles); paged ones do not, since each first page needs a fresh X-Next-Cursor.
+    All carry X-Brief-Mark, the high-water mark of what was sent. Passing it back as
+    `since` returns only newer articles and syncs only the days since the mark.
+
+    `sort=signal` ranks the brief (see app.services.ranking) before it is returned
+    or snapshotted, so cursor pages follow the ranked order.
+    """
+    if cursor:
+        decoded = decode_cursor(cursor)
+        if decoded is None:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        snapshot_id, offset = decoded
+        snapshot = await get_snapshot(db, snapshot_id, current_user.id)
+        if snapshot is None:
+            raise HTTPException(status_code=410, detail="Brief snapshot expired, generate the brief again")
+        if offset >= len(snapshot.articles):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        return _page(snapshot_id, snapshot, offset, limit or DEFAULT_PAGE_SIZE)
+
+    if profile_id is None:
+        raise HTTPException(status_code=400, detail="profile_id is required")
+    profile = await _load_profile(db, profile_id, current_user)
+    since_pmid, marked_on = _resolve_mark(since, profile)
+
+    articles: List[ArticleRecord] = []
+    truncated = False
+    newest = since_pmid
+    headers = {"Cache-Control": "private, no-cache"}
+    if profile.journals:
+        start_date, end_date = _resolve_window(days, from_date, to_date)
+        journal_ids = [j.id for j in profile.journals]
+
+        # Pull only the missing date ranges from PubMed, then serve from the local store.
+        # A delta only needs the days since its mark, plus the overlap PubMed backfills.
+        sync_from = start_date
+        if marked_on is not None:
+            sync_from = max(start_date, marked_on - timedelta(days=settings.ARTICLE_SYNC_OVERLAP_DAYS))
+        report = await sync_journals(db, profile.journals, sync_from, end_date)
+
+        version = await brief_version(db, journal_ids, start_date, end_date, since_pmid)
+        newest = max(version[0] or 0, since_pmid or 0) or None
+        if newest is not None:
+            headers["X-Brief-Mark"] = _encode_mark(newest, today())
+        # A 304 for a first page would leave the client with its old cursor, whose snapshot expires
+        if limit is None:
+            headers["ETag"] = _brief_etag(journal_ids, start_date, end_date, since_pmid, sort, report.truncated, version)
+            if _etag_matches(if_none_match, headers["ETag"]):
+                return Response(status_code=304, headers=headers)
+
+        articles, truncated = await query_articles(db, journal_ids, start_date, end_date, after_pmid=since_pmid)
+        truncated = truncated or report.truncated
+        if sort == "signal":
+            articles = await _rank(db, profile, articles, start_date, end_date, since_pmid)
+    BRIEF_ARTICLES.observe(len(articles))
+    await _store_mark(db, profile, newest)
+
+    if limit is None:
+        headers["X-Brief-Truncated"] = "true" if truncated else "false"
+        return _json_response(articles, headers)
+
+    snapshot_id = await create_snapshot(db, current_user.id, articles, truncated)
+    response = _page(snapshot_id, BriefSnapshot(current_user.id, articles, truncated), 0, limit)
+    response.headers.update(headers)
+    return response
+
+
+def _encode_mark(pmid: int, marked_on: date) -> str:
+    return f"{pmid}.{marked_on.isoformat()}"
+
+
+def _resolve_mark(since: Optional[str], profile: Profile) -> Tuple[Optional[int], Optional[date]]:
+    """(PMID, date issued) of a `since` mark; a bare PMID has no date."""
+    if not since:
+        return None, None
+    if since == "last":
+        return profile.brief_mark_pmid, profile.brief_marked_on
+    pmid, _, marked_on = since.partition(".")
+    try:
+        return int(pmid), date.fromisoformat(marked_on) if marked_on else None
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since mark")
+
+
+async def _store_mark(db: AsyncSession, profile: Profile, newest: Optional[int]) -> None:
+    """Advance the profile's high-water mark to the newest PMID served."""
+    if newest is None or (profile.brief_mark_pmid or 0) >= newest:
+        return
+    profile.brief_mark_pmid = newest
+    profile.brief_marked_on = today()
+    await db.commit()
+
+
+async def _rank(db: AsyncSession, profile: Profile, articles: List[ArticleRecord],
+                start_date: date, end_date: date, since_pmid: Optional[int]) -> List[ArticleRecord]:
+    """Order the brief by signal score; an article in several journals counts its best one."""
+    weights = journal_weights(profile.journals)
+    links = await article_journal_ids(db, list(weights), start_date, end_date, since_pmid)
+    article_weights = {
+        str(pmid): max(weights.get(j, DEFAULT_JOURNAL_WEIGHT) for j in journal_ids)
+        for pmid, journal_ids in links.items()
+    }
+    with span("rank"):
+        return rank_articles(articles, article_weights, start_date, end_date)
+
+
+def _brief_etag(journal_ids: List[int], start_date: date, end_date: date, since_pmid: Optional[int],
+                sort: str, truncated: bool, version: tuple) -> str:
+    key = repr((sorted(journal_ids), start_date, end_date, since_pmid, sort, truncated, version))
+    return '"' + hashlib.blake2b(key.encode(), digest_size=12).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+class BatchBriefRequest(BaseModel):
+    profile_ids: Optional[List[int]] = None  # All of the user's profiles when omitted
+    days: int = Field(default=7, ge=1, le=90)
+    from_date: Optional[str] = None
+    to_date: Optional[str] = None
+
+
+class ProfileBriefOut(BaseModel):
+    profile_id: int
+    name: str
+    truncated: bool
+    articles: List[ArticleOut]
+
+
+@router.post("/batch", response_model=List[ProfileBriefOut])
+async def generate_briefs(
+    data: BatchBriefRequest,
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
-    """Generate a brief for the given profile. Uses from_date/to_date if provided, otherwise last N days."""
-    result = await db.execute(
+    """
+    Generate briefs for several profiles at once. Journals shared between profiles
+    are synced from PubMed once (one ESearch per missing range over the union of
+    ISSNs), then the stored articles are split back out per profile.
+    """
+    query = (
         select(Profile)
         .options(selectinload(Profile.journals))
-        .where(Profile.id == profile_id, Profile.user_id == current_user.id)
+        .where(Profile.user_id == current_user.id)
+        .order_by(Profile.id)
     )
-    profile = result.scalar_one_or_none()
-    if not profile:
+    if data.profile_ids is not None:
+        query = query.where(Profile.id.in_(data.profile_ids))
+    profiles = (await db.execute(query)).scalars().all()
+    if data.profile_ids is not None and len(profiles) != len(set(data.profile_ids)):
         raise HTTPException(status_code=404, detail="Profile not found")
 
-    if not profile.journals:
-        return []
+    start_date, end_date = _resolve_window(data.days, data.from_date, data.to_date)
+    journals = list({j.id: j for p in profiles for j in p.journals}.values())
+    report = await sync_journals(db, journals, start_date, end_date)
+    briefs = await query_articles_for_groups(
+        db, {p.id: [j.id for j in p.journals] for p in profiles}, start_date, end_date
+    )
 
-    issns = [j.issn for j in profile.journals if j.issn]
-    
-    # Use explicit dates if provided, otherwise calculate from days
-    if from_date and to_date:
-        try:
-            start_date = date.fromisoformat(from_date)
-            end_date = date.fromisoformat(to_date)
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
-    else:
-        start_date = date.today() - timedelta(days=days)
-        end_date = date.today()
+    for p in profiles:
+        BRIEF_ARTICLES.observe(len(briefs[p.id][0]))
+    return _json_response([
+        {
+            "profile_id": p.id,
+            "name": p.name,
+            "truncated": briefs[p.id][1] or (report.truncated and bool(p.journals)),
+            "articles": briefs[p.id][0],
+        }
+        for p in profiles
+    ])
+
+
+def _page(snapshot_id: str, snapshot: BriefSnapshot, offset: int, limit: int) -> Response:
+    headers = {
+        "X-Brief-Total": str(len(snapshot.articles)),
+        "X-Brief-Truncated": "true" if snapshot.truncated else "false",
+    }
+    if offset + limit < len(snapshot.articles):
+        headers["X-Next-Cursor"] = encode_cursor(snapshot_id, offset + limit)
+    return _json_response(snapshot.articles[offset:offset + limit], headers)
+
+
+@router.get("/search", response_model=List[ArticleOut])
+async def search_brief(
+    profile_id: int,
+    q: str = Query(min_length=1, max_length=200),
+    limit: int = Query(default=20, ge=1, le=100),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Full-text search (title, abstract, authors) over the stored articles of the
+    profile's journals, best match first. Only articles already fetched by a brief
+    are searched; nothing is requested from PubMed.
+    """
+    profile = await _load_profile(db, profile_id, current_user)
+    return _json_response(await search_articles(db, [j.id for j in profile.journals], q, limit))
+
+
+@router.get("/generate/stream")
+async def stream_brief(
+    profile_id: int,
+    days: int = Query(default=7, ge=1, le=90),
+    from_date: Optional[str] = Query(default=None, description="Start date in YYYY-MM-DD format"),
+    to_date: Optional[str] = Query(default=None, description="End date in YYYY-MM-DD format"),
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_db),
+):
+    """
+    Streaming variant of /generate as NDJSON, one event per line:
+    {"type": "articles", "articles": [...]} for already stored articles and then for
+    each PubMed batch as it is parsed, followed by a final
+    {"type": "summary", "total": N, "truncated": bool, "partial": bool}.
+    At most PUBMED_MAX_ARTICLES articles are sent, as with /generate; past that
+    the summary is flagged truncated.
+    """
+    profile = await _load_profile(db, profile_id, current_user)
+    start_date, end_date = _resolve_window(days, from_date, to_date)
+    journal_ids = [j.id for j in profile.journals]
+
+    async def events():
+        seen = set()
+        stored_truncated = False
+        capped = False
+
+        def batch_event(articles: List[ArticleRecord]) -> bytes:
+            nonlocal capped
+            fresh = [a for a in articles if a.pmid not in seen]
+            # Same cap as /generate; the sync still runs to the end so the store is complete
+            room = settings.PUBMED_MAX_ARTICLES - len(seen)
+            if len(fresh) > room:
+                fresh = fresh[:room]
+                capped = True
+            seen.update(a.pmid for a in fresh)
+            with span("serialize"):
+                return dumps({"type": "articles", "articles": fresh}) + b"\n" if fresh else b""
+
+        report = SyncReport()
+        if journal_ids:
+            # The request's session is closed once the response starts, so stream with our own
+            async with async_session() as stream_db:
+                # What is already stored goes out first, then new batches as they arrive
+                stored, stored_truncated = await query_articles(stream_db, journal_ids, start_date, end_date)
+                yield batch_event(stored)
+                async for batch in iter_sync_journals(stream_db, profile.journals, start_date, end_date, report):
+                    yield batch_event(batch)
 
-    articles = await fetch_articles_for_journals(issns, start_date, end_date)
-    return articles
+        BRIEF_ARTICLES.observe(len(seen))
+        yield dumps({
+            "type": "summary",
+            "total": len(seen),
+            "truncated": stored_truncated or capped or report.truncated,
+            "partial": report.failed_ranges > 0,
+        }) + b"\n"
 
+    return StreamingResponse(events(), media_type="application/x-ndjson")
@@ -1,11 +1,12 @@
 from fastapi import APIRouter, Depends, Query
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import func, select
 from pydantic import BaseModel
 from typing import List, Optional
 
 from app.database import get_db
 from app.models import Journal
+from app.services.journal_index import get_index
 
 router = APIRouter()
 
@@ -14,6 +15,7 @@ class JournalOut(BaseModel):
     id: int
     name: str
     issn: Optional[str]
+    eissn: Optional[str] = None
     iso_abbreviation: Optional[str]
     category: Optional[str]
 
@@ -24,13 +26,10 @@ class JournalOut(BaseModel):
 @router.get("/search", response_model=List[JournalOut])
 async def search_journals(
     q: str = Query(..., min_length=2),
-    db: AsyncSession = Depends(get_db),
 ):
-    """Search journals by name (case-insensitive partial match)."""
-    result = await db.execute(
-        select(Journal).where(Journal.name.ilike(f"%{q}%")).limit(20)
-    )
-    return result.scalars().all()
+    """Search journals by name, ISO abbreviation or ISSN (prefix matches first, then partial)."""
+    index = await get_index()
+    return index.search(q, limit=20)
 
 
 @router.get("/presets/{category}", response_model=List[JournalOut])
@@ -40,7 +39,7 @@ async def get_preset_journals(
 ):
     """Get preset journals by category (e.g., 'cardiology', 'medicine')."""
     result = await db.execute(
-        select(Journal).where(Journal.category.ilike(category)).limit(10)
+        select(Journal).where(func.lower(Journal.category) == category.lower()).limit(10)
     )
     return result.scalars().all()
 
@@ -6,8 +6,8 @@ from pydantic import BaseModel
 from typing import List
 
 from app.database import get_db
-from app.models import Profile, Journal, User
-from app.routers.auth import get_current_user
+from app.models import Profile, Journal
+from app.routers.auth import Principal, get_current_user
 
 router = APIRouter()
 
@@ -28,7 +28,7 @@ class ProfileOut(BaseModel):
 
 @router.get("/", response_model=List[ProfileOut])
 async def list_profiles(
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     result = await db.execute(
@@ -46,7 +46,7 @@ async def list_profiles(
 @router.post("/", response_model=ProfileOut)
 async def create_profile(
     data: ProfileCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     # Fetch journals
@@ -65,7 +65,7 @@ async def create_profile(
 async def update_profile(
     profile_id: int,
     data: ProfileCreate,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Update a profile's name and journals."""
@@ -93,7 +93,7 @@ async def update_profile(
 @router.delete("/{profile_id}")
 async def delete_profile(
     profile_id: int,
-    current_user: User = Depends(get_current_user),
+    current_user: Principal = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
 ):
     """Delete a profile."""
@@ -0,0 +1,108 @@
+"""
+Startup schema management for existing databases.
+
+`Base.metadata.create_all` only creates missing tables, so columns and
+indexes added to existing models later are added here. Only additive changes
+are handled (new nullable columns, new indexes); anything else needs a real
+migration.
+
+Reflecting the whole schema on every boot is slow on a cold start, so the
+database is stamped with a fingerprint of the schema it was brought up to
+(model DDL plus SCHEMA_REVISION). A boot whose fingerprint matches the stamp
+skips the reflection and DDL entirely.
+"""
+import hashlib
+import logging
+
+from sqlalchemy import Column, String, Table, inspect, text
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+from sqlalchemy.schema import CreateColumn, CreateIndex, CreateTable
+
+from app.database import Base
+from app.services.search import detect_search_index, ensure_search_index
+
+logger = logging.getLogger(__name__)
+
+# Bump when schema objects created outside the models change (e.g. the search index DDL)
+SCHEMA_REVISION = 1
+
+schema_version = Table(
+    "schema_version",
+    Base.metadata,
+    Column("fingerprint", String, nullable=False),
+)
+
+
+async def prepare_schema(conn: AsyncConnection, mode: str = "check") -> bool:
+    """
+    Bring the database schema up to date. In "check" mode nothing is done if the
+    stored stamp matches the current schema; "sync" always reflects and upgrades.
+    Returns whether the schema was synced.
+    """
+    fingerprint = schema_fingerprint(conn.dialect)
+    if mode == "check" and await conn.run_sync(_read_stamp) == fingerprint:
+        await detect_search_index(conn)
+        return False
+
+    await conn.run_sync(Base.metadata.create_all)
+    await conn.run_sync(upgrade_schema)
+    await ensure_search_index(conn)
+    await conn.execute(schema_version.delete())
+    await conn.execute(schema_version.insert().values(fingerprint=fingerprint))
+    logger.info("Schema synced (%s)", fingerprint[:12])
+    return True
+
+
+def schema_fingerprint(dialect) -> str:
+    """Hash of the DDL for every model table and index, as the dialect would emit it."""
+    digest = hashlib.sha256(f"revision {SCHEMA_REVISION}".encode())
+    for table in Base.metadata.sorted_tables:
+        digest.update(str(CreateTable(table).compile(dialect=dialect)).encode())
+        for index in sorted(table.indexes, key=lambda i: i.name):
+            digest.update(str(CreateIndex(index).compile(dialect=dialect)).encode())
+    return digest.hexdigest()
+
+
+def _read_stamp(conn: Connection):
+    if not inspect(conn).has_table(schema_version.name):
+        return None
+    return conn.execute(schema_version.select()).scalar()
+
+
+def upgrade_schema(conn: Connection) -> None:
+    """Add model columns and indexes missing from tables that already exist. Run via conn.run_sync."""
+    inspector = inspect(conn)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+
+        existing_columns = {c["name"] for c in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in existing_columns:
+                continue
+            if not column.nullable:
+                logger.warning("Cannot add NOT NULL column %s.%s automatically", table.name, column.name)
+                continue
+            logger.info("Adding column %s.%s", table.name, column.name)
+            table_name = conn.dialect.identifier_preparer.format_table(table)
+            column_ddl = CreateColumn(column).compile(dialect=conn.dialect)
+            conn.execute(text(f"ALTER TABLE {table_name} ADD COLUMN {column_ddl}"))
+
+        existing_indexes = _index_names(conn, inspector, table.name)
+        for index in table.indexes:
+            if index.name not in existing_indexes:
+                logger.info("Creating index %s", index.name)
+                index.create(conn)
+
+
+def _index_names(conn: Connection, inspector, table_name: str) -> set:
+    if conn.dialect.name == "sqlite":
+        # The SQLite inspector skips expression indexes such as lower(category)
+        rows = conn.execute(
+            text("SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = :table"),
+            {"table": table_name},
+        )
+        return {row[0] for row in rows}
+    return {i["name"] for i in inspector.get_indexes(table_name)}
@@ -0,0 +1,456 @@
+"""
+Local article store with incremental per-ISSN sync from PubMed.
+
+Briefs are served from the `articles` table. Before querying, `sync_journals`
+asks PubMed only for the part of the requested date window that has not been
+fetched yet for each ISSN (tracked in `journal_syncs`).
+"""
+import logging
+import re
+from collections import defaultdict
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import AsyncIterator, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.database import dialect_insert
+from app.models import Article, Journal, JournalSync, article_journals
+from app.services.clock import utc_now
+from app.services.metrics import span
+from app.services.pubmed import PubMedError, iter_search_pages
+from app.services.records import ArticleRecord
+
+ONE_DAY = timedelta(days=1)
+
+logger = logging.getLogger(__name__)
+
+_MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+
+
+@dataclass
+class SyncReport:
+    """What happened while syncing journals for a brief."""
+    fetched: int = 0  # Articles fetched from PubMed and stored
+    truncated: bool = False  # Some range had more articles than PUBMED_MAX_ARTICLES
+    failed_ranges: int = 0  # Ranges that could not be fetched completely
+
+
+async def sync_journals(
+    db: AsyncSession,
+    journals: Iterable[Journal],
+    start_date: date,
+    end_date: date,
+) -> SyncReport:
+    """Fetch and store whatever part of [start_date, end_date] is missing for the journals."""
+    report = SyncReport()
+    async for _ in iter_sync_journals(db, journals, start_date, end_date, report):
+        pass
+    return report
+
+
+async def iter_sync_journals(
+    db: AsyncSession,
+    journals: Iterable[Journal],
+    start_date: date,
+    end_date: date,
+    report: SyncReport,
+) -> AsyncIterator[List[ArticleRecord]]:
+    """
+    Sync the missing ranges like sync_journals, yielding the newly stored articles
+    page by page as PubMed returns them.
+    """
+    journals = [j for j in journals if j.issn]
+    if not journals:
+        return
+
+    now = utc_now()
+    end_date = min(end_date, now.date())
+    if start_date > end_date:
+        return
+
+    result = await db.execute(
+        select(JournalSync).where(JournalSync.issn.in_([j.issn for j in journals]))
+    )
+    states = {s.issn: s for s in result.scalars().all()}
+
+    # Journals missing the same range share one ESearch
+    pending: Dict[Tuple[date, date], List[Journal]] = defaultdict(list)
+    for journal in journals:
+        for missing in _missing_ranges(states.get(journal.issn), start_date, end_date, now):
+            pending[missing].append(journal)
+
+    for (range_start, range_end), group in pending.items():
+        published = []
+        truncated = False
+        try:
+            async for page in iter_search_pages([j.issn for j in group], range_start, range_end):
+                with span("store"):
+                    stored = await _store_articles(db, page.articles, group, range_start, range_end)
+                    # Commit before waiting on the next page: SQLite has a single writer lock
+                    await db.commit()
+                published.extend(published_on for _, published_on in stored)
+                truncated = page.truncated
+                report.fetched += len(stored)
+                yield [article for article, _ in stored]
+        except PubMedError as e:
+            # Keep what arrived; the range stays missing and is retried next time
+            logger.warning("Article store: sync failed for %d journal(s): %s", len(group), e)
+            report.failed_ranges += 1
+            await db.commit()
+            continue
+
+        covered_from = range_start
+        if truncated:
+            # Results come newest first, so only the days after the oldest one stored are complete
+            report.truncated = True
+            covered_from = min(published, default=range_end) + ONE_DAY
+        if covered_from <= range_end:
+            for journal in group:
+                await _record_sync(db, states, journal.issn, covered_from, range_end, now)
+        await db.commit()
+
+
+async def query_articles(
+    db: AsyncSession,
+    journal_ids: List[int],
+    start_date: date,
+    end_date: date,
+    limit: Optional[int] = None,
+    after_pmid: Optional[int] = None,
+) -> Tuple[List[ArticleRecord], bool]:
+    """
+    Return (articles, truncated): stored articles for the journals in the window,
+    newest first, capped at `limit` (default PUBMED_MAX_ARTICLES). With
+    `after_pmid`, only articles with a higher PMID (newer PubMed records).
+    """
+    if not journal_ids:
+        return [], False
+    limit = limit or settings.PUBMED_MAX_ARTICLES
+    with span("query"):
+        result = await db.execute(
+            _window_query(select(Article), journal_ids, start_date, end_date, after_pmid)
+            .order_by(Article.published_on.desc(), Article.pmid.desc())
+            .limit(limit + 1)
+        )
+        rows = result.scalars().all()
+        return [article_to_record(a) for a in rows[:limit]], len(rows) > limit
+
+
+async def brief_version(
+    db: AsyncSession,
+    journal_ids: List[int],
+    start_date: date,
+    end_date: date,
+    after_pmid: Optional[int] = None,
+) -> Tuple[Optional[int], int, Optional[datetime]]:
+    """
+    (newest PMID, article count, latest store time) of what query_articles would
+    return, from one aggregate query. Any change to those articles changes it.
+    """
+    if not journal_ids:
+        return None, 0, None
+    with span("query"):
+        result = await db.execute(
+            _window_query(
+                select(func.max(Article.pmid), func.count(), func.max(Article.fetched_at)),
+                journal_ids, start_date, end_date, after_pmid,
+            )
+        )
+        return tuple(result.one())
+
+
+async def article_journal_ids(
+    db: AsyncSession,
+    journal_ids: List[int],
+    start_date: date,
+    end_date: date,
+    after_pmid: Optional[int] = None,
+) -> Dict[int, List[int]]:
+    """PMID -> which of the journals it is linked to, for the articles query_articles would return."""
+    if not journal_ids:
+        return {}
+    stmt = (
+        select(article_journals.c.article_pmid, article_journals.c.journal_id)
+        .join(Article, Article.pmid == article_journals.c.article_pmid)
+        .where(
+            article_journals.c.journal_id.in_(journal_ids),
+            Article.published_on.between(start_date, end_date),
+        )
+    )
+    if after_pmid is not None:
+        stmt = stmt.where(Article.pmid > after_pmid)
+    with span("query"):
+        result = await db.execute(stmt)
+    links: Dict[int, List[int]] = defaultdict(list)
+    for pmid, journal_id in result.all():
+        links[pmid].append(journal_id)
+    return links
+
+
+def _window_query(stmt, journal_ids: List[int], start_date: date, end_date: date, after_pmid: Optional[int]):
+    stmt = stmt.where(
+        Article.pmid.in_(
+            select(article_journals.c.article_pmid)
+            .where(article_journals.c.journal_id.in_(journal_ids))
+        ),
+        Article.published_on.between(start_date, end_date),
+    )
+    if after_pmid is not None:
+        stmt = stmt.where(Article.pmid > after_pmid)
+    return stmt
+
+
+async def query_articles_for_groups(
+    db: AsyncSession,
+    groups: Dict[int, List[int]],
+    start_date: date,
+    end_date: date,
+    limit: Optional[int] = None,
+) -> Dict[int, Tuple[List[ArticleRecord], bool]]:
+    """
+    Like query_articles for several groups of journal ids (e.g. one per profile)
+    with a single query over their union; each article is loaded once and handed
+    to every group that has one of its journals.
+    """
+    limit = limit or settings.PUBMED_MAX_ARTICLES
+    groups_by_journal: Dict[int, List[int]] = defaultdict(list)
+    for group_id, journal_ids in groups.items():
+        for journal_id in set(journal_ids):
+            groups_by_journal[journal_id].append(group_id)
+    found: Dict[int, Tuple[List[ArticleRecord], bool]] = {group_id: ([], False) for group_id in groups}
+    if not groups_by_journal:
+        return found
+
+    with span("query"):
+        result = await db.execute(
+            select(Article, article_journals.c.journal_id)
+            .join(article_journals, article_journals.c.article_pmid == Article.pmid)
+            .where(
+                article_journals.c.journal_id.in_(list(groups_by_journal)),
+                Article.published_on.between(start_date, end_date),
+            )
+            .order_by(Article.published_on.desc(), Article.pmid.desc())
+        )
+        rows = result.all()
+    articles: Dict[int, List[ArticleRecord]] = defaultdict(list)
+    seen: Dict[int, set] = defaultdict(set)
+    converted: Dict[int, ArticleRecord] = {}
+    for article, journal_id in rows:
+        for group_id in groups_by_journal[journal_id]:
+            if article.pmid in seen[group_id]:
+                continue  # Linked to more than one of the group's journals
+            seen[group_id].add(article.pmid)
+            if article.pmid not in converted:
+                converted[article.pmid] = article_to_record(article)
+            articles[group_id].append(converted[article.pmid])
+
+    for group_id, group_articles in articles.items():
+        found[group_id] = group_articles[:limit], len(group_articles) > limit
+    return found
+
+
+def article_to_record(article: Article) -> ArticleRecord:
+    """Convert a stored article into the record served by the briefs API."""
+    return ArticleRecord(
+        pmid=str(article.pmid),
+        title=article.title,
+        authors=article.authors or (),
+        journal=article.journal,
+        pub_date=article.pub_date,
+        abstract=article.abstract,
+        doi=article.doi,
+        # Stored records carry the sortable date, which ranking uses for recency
+        epub_date=article.published_on.isoformat() if article.published_on else "",
+        publication_types=article.publication_types or (),
+        mesh_major=article.mesh_major or (),
+    )
+
+
+def _missing_ranges(
+    state: Optional[JournalSync],
+    start_date: date,
+    end_date: date,
+    now: datetime,
+) -> List[Tuple[date, date]]:
+    """Date ranges within [start_date, end_date] not yet covered by the sync state."""
+    if state is None:
+        return [(start_date, end_date)]
+
+    ranges = []
+    if start_date < state.synced_from:
+        ranges.append((start_date, min(end_date, state.synced_from - ONE_DAY)))
+
+    # Recent days keep receiving records for a while, so once the sync is stale
+    # the tail of the covered range is fetched again.
+    fresh_through = state.synced_through
+    is_stale = now - state.synced_at > timedelta(minutes=settings.ARTICLE_SYNC_TTL_MINUTES)
+    overlap = timedelta(days=settings.ARTICLE_SYNC_OVERLAP_DAYS)
+    if is_stale and state.synced_at.date() - state.synced_through < overlap:
+        fresh_through -= overlap
+
+    if end_date > fresh_through:
+        ranges.append((max(start_date, fresh_through + ONE_DAY), end_date))
+    return ranges
+
+
+async def _record_sync(
+    db: AsyncSession,
+    states: Dict[str, JournalSync],
+    issn: str,
+    range_start: date,
+    range_end: date,
+    now: datetime,
+) -> None:
+    """Extend the ISSN's covered range with a freshly fetched one."""
+    state = states.get(issn)
+    if state is None:
+        synced_from, synced_through = range_start, range_end
+    elif range_start <= state.synced_through + ONE_DAY and range_end >= state.synced_from - ONE_DAY:
+        synced_from = min(state.synced_from, range_start)
+        synced_through = max(state.synced_through, range_end)
+    elif range_start > state.synced_through:
+        # Disjoint and newer: the recent range is the one worth keeping
+        synced_from, synced_through = range_start, range_end
+    else:
+        return
+
+    stmt = dialect_insert(JournalSync.__table__).values(
+        issn=issn, synced_from=synced_from, synced_through=synced_through, synced_at=now,
+    )
+    await db.execute(stmt.on_conflict_do_update(
+        index_elements=["issn"],
+        set_={"synced_from": synced_from, "synced_through": synced_through, "synced_at": now},
+    ))
+    states[issn] = JournalSync(
+        issn=issn, synced_from=synced_from, synced_through=synced_through, synced_at=now,
+    )
+
+
+async def _store_articles(
+    db: AsyncSession,
+    articles: List[ArticleRecord],
+    journals: List[Journal],
+    range_start: date,
+    range_end: date,
+) -> List[Tuple[ArticleRecord, date]]:
+    """
+    Upsert fetched articles and link each one to its journal.
+    Returns (article, published_on) for each article stored.
+    """
+    by_issn = {issn.upper(): j for j in journals for issn in (j.issn, j.eissn) if issn}
+    by_abbrev = {j.iso_abbreviation.lower(): j for j in journals if j.iso_abbreviation}
+
+    article_rows = []
+    link_rows = []
+    stored = []
+    fetched_at = utc_now()
+    for a in articles:
+        if not a.pmid.isdigit():
+            continue
+        journal = _journal_for_article(a, by_issn, by_abbrev, journals)
+        if journal is None:
+            logger.info("Article store: could not match PMID %s to a journal, skipping", a.pmid)
+            continue
+        published_on = _published_on(a, range_start, range_end)
+        article_rows.append(article_row(a, published_on, fetched_at))
+        link_rows.append({"journal_id": journal.id, "article_pmid": int(a.pmid)})
+        stored.append((a, published_on))
+
+    await upsert_articles(db, article_rows, link_rows)
+    return stored
+
+
+def article_row(article: ArticleRecord, published_on: Optional[date], fetched_at: datetime) -> dict:
+    """Values for the `articles` table from a parsed record."""
+    return {
+        "pmid": int(article.pmid),
+        "title": article.title,
+        "authors": list(article.authors),
+        "journal": article.journal,
+        "pub_date": article.pub_date,
+        "published_on": published_on,
+        "abstract": article.abstract,
+        "doi": article.doi,
+        "fetched_at": fetched_at,
+        "publication_types": list(article.publication_types),
+        "mesh_major": list(article.mesh_major),
+    }
+
+
+async def upsert_articles(db: AsyncSession, article_rows: List[dict], link_rows: List[dict]) -> None:
+    """Insert or update article rows (see article_row) and add their journal links."""
+    if not article_rows:
+        return
+    stmt = dialect_insert(Article.__table__)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["pmid"],
+            set_={col: stmt.excluded[col] for col in article_rows[0] if col != "pmid"},
+        ),
+        article_rows,
+    )
+    if link_rows:
+        await db.execute(
+            dialect_insert(article_journals).on_conflict_do_nothing(),
+            link_rows,
+        )
+
+
+def _journal_for_article(
+    article: ArticleRecord,
+    by_issn: Dict[str, Journal],
+    by_abbrev: Dict[str, Journal],
+    journals: List[Journal],
+) -> Optional[Journal]:
+    """Work out which of the searched journals a fetched record came from."""
+    for issn in article.issns:
+        if issn.upper() in by_issn:
+            return by_issn[issn.upper()]
+    abbrev = (article.journal_abbrev or "").lower()
+    if abbrev in by_abbrev:
+        return by_abbrev[abbrev]
+    if len(journals) == 1:
+        return journals[0]
+    return None
+
+
+def _published_on(article: ArticleRecord, range_start: date, range_end: date) -> date:
+    """
+    Sortable publication date, clamped to the window ESearch matched it in.
+
+    PubMed's [PDAT] matches on either the print or electronic date and print
+    dates are often partial (month or year only), so the parsed date is pulled
+    into the searched window to keep local queries consistent with ESearch.
+    """
+    parsed = publication_date(article)
+    if parsed is None:
+        return range_end
+    return min(max(parsed, range_start), range_end)
+
+
+def publication_date(article: ArticleRecord) -> Optional[date]:
+    """Publication date of a record: the electronic date if known, else the (possibly partial) print date."""
+    return _parse_date(article.epub_date) or _parse_date(article.pub_date)
+
+
+def _parse_date(value: str) -> Optional[date]:
+    """Parse PubMed dates like "2025-Jan-05", "2025-01-05", "2025-Jan" or "2025"."""
+    parts = [p for p in re.split(r"[-\s]+", value.strip()) if p]
+    if not parts or not parts[0].isdigit():
+        return None
+    year = int(parts[0])
+    month = 1
+    day = 1
+    if len(parts) > 1:
+        month = int(parts[1]) if parts[1].isdigit() else _MONTHS.get(parts[1][:3].lower(), 1)
+    if len(parts) > 2 and parts[2].isdigit():
+        day = int(parts[2])
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return None
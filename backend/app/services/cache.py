@@ -0,0 +1,157 @@
+"""
+Small in-process caching helpers: a TTL + LRU cache and single-flight coalescing.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+
+class TTLCache:
+    """
+    Least-recently-used cache whose entries expire after `ttl` seconds.
+
+    Size is bounded by entry count and, optionally, by a total weight computed
+    with `weigher` (e.g. number of articles held by an entry).
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttl: float,
+        max_weight: Optional[int] = None,
+        weigher: Optional[Callable[[Any], int]] = None,
+    ):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.max_weight = max_weight
+        self.weigher = weigher or (lambda value: 1)
+        self._data: "OrderedDict[Hashable, Tuple[float, int, Any]]" = OrderedDict()
+        self._weight = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None."""
+        found = self.lookup(key)
+        return found[1] if found else None
+
+    def lookup(
+        self,
+        key: Hashable,
+        covers: Optional[Callable[[Hashable, Any], bool]] = None,
+    ) -> Optional[Tuple[Hashable, Any]]:
+        """
+        Return (matched_key, value) for key, or for the most recently used entry
+        accepted by `covers(entry_key, value)` when there is no exact entry.
+        """
+        now = time.monotonic()
+        entry = self._live_entry(key, now)
+        if entry is not None:
+            self.hits += 1
+            self._data.move_to_end(key)
+            return key, entry[2]
+
+        if covers is not None:
+            for other_key in reversed(list(self._data)):
+                other = self._live_entry(other_key, now)
+                if other is not None and covers(other_key, other[2]):
+                    self.hits += 1
+                    self._data.move_to_end(other_key)
+                    return other_key, other[2]
+
+        self.misses += 1
+        return None
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        """Store value under key (for `ttl` seconds instead of the default, if given), evicting as needed."""
+        self.pop(key)
+        weight = self.weigher(value)
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), weight, value)
+        self._weight += weight
+        while self._data and (
+            len(self._data) > self.max_entries
+            or (self.max_weight is not None and self._weight > self.max_weight)
+        ):
+            oldest = next(iter(self._data))
+            if oldest == key and len(self._data) == 1:
+                break  # A single oversized entry is kept rather than thrown away
+            self.pop(oldest)
+            self.evictions += 1
+
+    def pop(self, key: Hashable) -> Optional[Any]:
+        """Remove key and return its value, if present."""
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return None
+        self._weight -= entry[1]
+        return entry[2]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._weight = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._data),
+            "weight": self._weight,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+        }
+
+    def _live_entry(self, key: Hashable, now: float) -> Optional[Tuple[float, int, Any]]:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= now:
+            self.pop(key)
+            self.expirations += 1
+            return None
+        return entry
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share its result."""
+
+    def __init__(self):
+        self._inflight: Dict[Hashable, "asyncio.Future[Any]"] = {}
+        self.shared = 0  # Callers served by another caller's run
+
+    def inflight_keys(self):
+        return list(self._inflight)
+
+    def get(self, key: Hashable) -> Optional["asyncio.Future[Any]"]:
+        """Future for a call already running under key, if any."""
+        return self._inflight.get(key)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await the running call for key, or start fn() as that call."""
+        existing = self._inflight.get(key)
+        if existing is not None:
+            self.shared += 1
+            return await asyncio.shield(existing)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            result = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Mark retrieved so an unshared failure doesn't log "exception never retrieved"
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._inflight[key]
@@ -0,0 +1,18 @@
+"""
+The one clock briefs and the article store read "now" and "today" from.
+
+Sync state and fetch times are kept in UTC, so brief windows, marks and the
+sync's end-of-window clamp use the UTC date too; mixing in the server's local
+date would shift the window by a day around midnight.
+"""
+from datetime import date, datetime, timezone
+
+
+def utc_now() -> datetime:
+    """Current UTC time, naive like the DateTime columns it is stored in and compared with."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def today() -> date:
+    """Today's UTC date."""
+    return datetime.now(timezone.utc).date()
@@ -0,0 +1,164 @@
+"""
+Cache shared by every worker process on the host, stored in a local SQLite file.
+
+In-process caches are duplicated per worker, so each worker would fetch the
+same journals from NCBI itself. This one lives on disk: every write is a
+single SQLite transaction (readers never see a partial value), entries expire
+after `ttl` seconds, the least recently used entries are evicted once the
+values exceed `max_bytes`, and a lease table lets one process claim a key
+while it refreshes it so the others wait for its result instead of repeating
+the fetch.
+
+Calls block on SQLite, so async code runs them with asyncio.to_thread.
+"""
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS entries (
+        key TEXT PRIMARY KEY,
+        value BLOB NOT NULL,
+        size INTEGER NOT NULL,
+        expires_at REAL NOT NULL,
+        accessed_at REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS ix_entries_accessed_at ON entries (accessed_at)",
+    """CREATE TABLE IF NOT EXISTS leases (
+        key TEXT PRIMARY KEY,
+        owner TEXT NOT NULL,
+        expires_at REAL NOT NULL
+    )""",
+]
+
+
+class DiskCache:
+    def __init__(self, path: str, ttl: float, max_bytes: int):
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._token = uuid.uuid4().hex
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self.evictions = 0
+        self.errors = 0
+
+    @property
+    def _owner(self) -> str:
+        """Lease owner id, unique per process (forked workers included)."""
+        return f"{os.getpid()}-{self._token}"
+
+    def get(self, key: str) -> Optional[bytes]:
+        """The live value for key, or None."""
+        now = time.time()
+        row = self._execute(
+            "SELECT value FROM entries WHERE key = ? AND expires_at > ?", (key, now), fetch=True,
+        )
+        if not row:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._execute("UPDATE entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return row[0]
+
+    def set(self, key: str, value: bytes) -> None:
+        """Store value under key, then evict expired and least recently used entries over the size cap."""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    conn.execute(
+                        "INSERT OR REPLACE INTO entries (key, value, size, expires_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+                        (key, value, len(value), now + self.ttl, now),
+                    )
+                    conn.execute("DELETE FROM entries WHERE expires_at <= ?", (now,))
+                    total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM entries").fetchone()[0]
+                    if total > self.max_bytes:
+                        self.evictions += self._evict(conn, total - self.max_bytes, keep=key)
+                self.writes += 1
+            except sqlite3.Error as e:
+                self._failed(e)
+
+    def acquire(self, key: str, timeout: float) -> bool:
+        """Claim key for `timeout` seconds unless another live lease holds it."""
+        now = time.time()
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    cursor = conn.execute(
+                        """INSERT INTO leases (key, owner, expires_at) VALUES (?, ?, ?)
+                           ON CONFLICT (key) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at
+                           WHERE leases.expires_at <= ? OR leases.owner = excluded.owner""",
+                        (key, self._owner, now + timeout, now),
+                    )
+                    return cursor.rowcount > 0
+            except sqlite3.Error as e:
+                self._failed(e)
+                return True  # Without the cache, fetch as if uncoordinated
+
+    def release(self, key: str) -> None:
+        self._execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, self._owner))
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+    def _evict(self, conn: sqlite3.Connection, excess: int, keep: str) -> int:
+        evicted = 0
+        rows = conn.execute(
+            "SELECT key, size FROM entries WHERE key != ? ORDER BY accessed_at", (keep,),
+        ).fetchall()
+        for key, size in rows:
+            if excess <= 0:
+                break
+            conn.execute("DELETE FROM entries WHERE key = ?", (key,))
+            excess -= size
+            evicted += 1
+        return evicted
+
+    def _execute(self, sql: str, params: tuple, fetch: bool = False):
+        with self._lock:
+            try:
+                conn = self._connect()
+                with conn:
+                    cursor = conn.execute(sql, params)
+                    return cursor.fetchone() if fetch else None
+            except sqlite3.Error as e:
+                self._failed(e)
+                return None
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        # First use in this process; a connection inherited through fork must not be reused
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        for statement in _SCHEMA:
+            conn.execute(statement)
+        conn.isolation_level = ""  # Back to implicit transactions, committed by `with conn`
+        self._conn = conn
+        self._conn_pid = os.getpid()
+        return conn
+
+    def _failed(self, error: sqlite3.Error) -> None:
+        # The cache is an optimization: log and carry on without it
+        self.errors += 1
+        logger.warning("Shared cache %s: %s", self.path, error)
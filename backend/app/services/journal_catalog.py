@@ -0,0 +1,167 @@
+"""
+Bulk journal import: the NLM MEDLINE journal catalog and the preset journals.
+
+The catalog is NLM's J_Medline.txt (https://ftp.ncbi.nlm.nih.gov/pubmed/J_Medline.txt,
+downloaded beforehand; nothing is fetched here). It is read line by line and
+upserted in batches keyed on ISSN, so re-importing updates journals in place
+and existing journal ids - and the profiles pointing at them - stay valid.
+"""
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Union
+
+from sqlalchemy import case, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.database import dialect_insert
+from app.models import Journal
+
+logger = logging.getLogger(__name__)
+
+IMPORT_BATCH_SIZE = 1000
+
+# J_Medline.txt field name -> journal attribute
+_CATALOG_FIELDS = {
+    "JournalTitle": "name",
+    "ISSN (Print)": "issn",
+    "ISSN (Online)": "eissn",
+    "IsoAbbr": "iso_abbreviation",
+    "MedAbbr": "med_abbreviation",
+}
+
+
+@dataclass
+class ImportReport:
+    read: int = 0  # Catalog records read
+    upserted: int = 0  # Journals inserted or updated
+    skipped: int = 0  # Records without any ISSN
+
+
+def iter_catalog(path: Union[str, Path]) -> Iterator[dict]:
+    """
+    Yield one dict per J_Medline.txt record (name, issn, eissn, iso_abbreviation),
+    streaming the file. Records are separated by lines of dashes.
+    """
+    record: Dict[str, str] = {}
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if line.startswith("---"):
+                if record:
+                    yield _catalog_journal(record)
+                record = {}
+                continue
+            key, sep, value = line.partition(":")
+            if sep and key in _CATALOG_FIELDS:
+                record[_CATALOG_FIELDS[key]] = value.strip()
+    if record:
+        yield _catalog_journal(record)
+
+
+def _catalog_journal(record: Dict[str, str]) -> dict:
+    return {
+        "name": record.get("name", ""),
+        "issn": record.get("issn") or None,
+        "eissn": record.get("eissn") or None,
+        "iso_abbreviation": record.get("iso_abbreviation") or record.get("med_abbreviation") or None,
+    }
+
+
+async def import_catalog(
+    db: AsyncSession,
+    path: Union[str, Path],
+    batch_size: int = IMPORT_BATCH_SIZE,
+) -> ImportReport:
+    """Stream the catalog file into the journals table in bulk batches."""
+    report = ImportReport()
+    known = await _known_issns(db)
+    batch: List[dict] = []
+    for journal in iter_catalog(path):
+        report.read += 1
+        if not journal["issn"] and not journal["eissn"]:
+            report.skipped += 1
+            continue
+        batch.append(journal)
+        if len(batch) >= batch_size:
+            report.upserted += await _upsert_catalog_batch(db, batch, known)
+            batch = []
+    if batch:
+        report.upserted += await _upsert_catalog_batch(db, batch, known)
+    await db.commit()
+    logger.info("Journal catalog: %d read, %d upserted, %d without ISSN", report.read, report.upserted, report.skipped)
+    return report
+
+
+async def upsert_presets(db: AsyncSession, journals: Iterable[dict]) -> int:
+    """
+    Insert or update curated journals (name, issn, iso_abbreviation, category) by ISSN.
+    Their names, abbreviations and categories overwrite whatever is stored.
+    """
+    known = await _known_issns(db)
+    rows: Dict[str, dict] = {}
+    for journal in journals:
+        # A preset may use the ISSN an imported journal carries as its electronic one
+        issn = known.get(journal["issn"], journal["issn"])
+        rows[issn] = {**journal, "issn": issn}
+    if not rows:
+        return 0
+    stmt = dialect_insert(Journal.__table__)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["issn"],
+            set_={col: stmt.excluded[col] for col in ("name", "iso_abbreviation", "category")},
+        ),
+        list(rows.values()),
+    )
+    await db.commit()
+    return len(rows)
+
+
+async def _known_issns(db: AsyncSession) -> Dict[str, str]:
+    """Stored ISSN for every print or electronic ISSN already in the table."""
+    result = await db.execute(select(Journal.issn, Journal.eissn))
+    known: Dict[str, str] = {}
+    for issn, eissn in result.all():
+        if eissn:
+            known[eissn] = issn
+        if issn:
+            known[issn] = issn
+    return known
+
+
+async def _upsert_catalog_batch(db: AsyncSession, journals: List[dict], known: Dict[str, str]) -> int:
+    rows: Dict[str, dict] = {}
+    for journal in journals:
+        key = _stored_issn(journal, known)
+        known.setdefault(key, key)
+        if journal["eissn"]:
+            known.setdefault(journal["eissn"], key)
+        # One row per key, or Postgres refuses to update the same row twice in a statement
+        rows[key] = {**journal, "issn": key}
+
+    table = Journal.__table__
+    stmt = dialect_insert(table)
+    await db.execute(
+        stmt.on_conflict_do_update(
+            index_elements=["issn"],
+            set_={
+                "eissn": stmt.excluded.eissn,
+                "iso_abbreviation": stmt.excluded.iso_abbreviation,
+                # Curated (categorised) journals keep their display names
+                "name": case((table.c.category.is_(None), stmt.excluded.name), else_=table.c.name),
+            },
+        ),
+        list(rows.values()),
+    )
+    return len(rows)
+
+
+def _stored_issn(journal: dict, known: Dict[str, str]) -> str:
+    """
+    ISSN to key the journal on: the one an existing row is already stored under
+    (seeded journals may use the electronic ISSN), else the print ISSN.
+    """
+    for issn in (journal["issn"], journal["eissn"]):
+        if issn and issn in known:
+            return known[issn]
+    return journal["issn"] or journal["eissn"]
@@ -0,0 +1,169 @@
+"""
+In-memory journal search index for autocomplete.
+
+Built from the journals table at startup and rebuilt when journals change,
+so keystroke searches never touch the database. Matches name, ISO
+abbreviation and ISSN; prefix hits rank ahead of substring hits.
+"""
+import asyncio
+import heapq
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import select
+
+from app.config import settings
+from app.database import async_session
+from app.models import Journal
+
+
+@dataclass(frozen=True)
+class JournalEntry:
+    id: int
+    name: str
+    issn: Optional[str]
+    eissn: Optional[str]
+    iso_abbreviation: Optional[str]
+    category: Optional[str]
+
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _grams(text: str, n: int) -> Set[str]:
+    return {text[i:i + n] for i in range(len(text) - n + 1)}
+
+
+class JournalIndex:
+    """Sorted-prefix list plus trigram (and lazily bigram) postings over journal search keys."""
+
+    def __init__(self, journals: Iterable[JournalEntry]):
+        self.entries: Dict[int, JournalEntry] = {}
+        self._keys: Dict[int, Tuple[str, ...]] = {}
+        prefixes: List[Tuple[str, int]] = []
+        trigrams: Dict[str, Set[int]] = defaultdict(set)
+
+        for entry in journals:
+            keys = [_normalize(entry.name)]
+            if entry.iso_abbreviation:
+                keys.append(_normalize(entry.iso_abbreviation))
+            for issn in (entry.issn, entry.eissn):
+                if issn:
+                    issn = _normalize(issn)
+                    keys += [issn, issn.replace("-", "")]
+            keys = tuple(dict.fromkeys(k for k in keys if k))
+
+            self.entries[entry.id] = entry
+            self._keys[entry.id] = keys
+            for key in keys:
+                prefixes.append((key, entry.id))
+                for gram in _grams(key, 3):
+                    trigrams[gram].add(entry.id)
+
+        prefixes.sort()
+        self._prefix_keys = [key for key, _ in prefixes]
+        self._prefix_ids = [journal_id for _, journal_id in prefixes]
+        self._trigrams = dict(trigrams)
+        self._bigrams: Optional[Dict[str, Set[int]]] = None  # Built on the first 2-character query
+
+        # Shorter names first among prefix hits (an exact "Heart" before "Heart Rhythm")
+        ordered = sorted(self.entries.values(), key=lambda e: (len(e.name), e.name))
+        self._rank = {e.id: rank for rank, e in enumerate(ordered)}
+
+        # Autocomplete repeats the same few prefixes across users
+        self._search = lru_cache(maxsize=4096)(self._search)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def search(self, query: str, limit: int = 20) -> List[JournalEntry]:
+        q = _normalize(query)
+        if not q:
+            return []
+        return list(self._search(q, limit))
+
+    def _search(self, q: str, limit: int) -> Tuple[JournalEntry, ...]:
+
+        # Prefix hits: walk the sorted keys from the first one >= q
+        prefix_ids: Dict[int, None] = {}
+        i = bisect_left(self._prefix_keys, q)
+        while i < len(self._prefix_keys) and self._prefix_keys[i].startswith(q):
+            prefix_ids[self._prefix_ids[i]] = None
+            i += 1
+        ranked = heapq.nsmallest(limit, prefix_ids, key=self._rank.__getitem__)
+        if len(ranked) >= limit:
+            return tuple(self.entries[jid] for jid in ranked)
+
+        # Substring hits: intersect n-gram postings, then confirm against the keys
+        postings = self._trigrams if len(q) >= 3 else self._bigram_postings()
+        candidates: Optional[Set[int]] = None
+        for gram in sorted(_grams(q, 3 if len(q) >= 3 else 2), key=lambda g: len(postings.get(g, ()))):
+            ids = postings.get(gram)
+            if not ids:
+                candidates = set()
+                break
+            candidates = set(ids) if candidates is None else candidates & ids
+            if not candidates:
+                break
+
+        substring_hits = []
+        for jid in candidates or ():
+            if jid in prefix_ids:
+                continue
+            positions = [key.find(q) for key in self._keys[jid]]
+            positions = [p for p in positions if p >= 0]
+            if positions:
+                substring_hits.append((min(positions), self.entries[jid].name, jid))
+        substring_hits = heapq.nsmallest(limit - len(ranked), substring_hits)
+
+        ranked += [jid for _, _, jid in substring_hits]
+        return tuple(self.entries[jid] for jid in ranked[:limit])
+
+    def _bigram_postings(self) -> Dict[str, Set[int]]:
+        if self._bigrams is None:
+            bigrams: Dict[str, Set[int]] = defaultdict(set)
+            for journal_id, keys in self._keys.items():
+                for key in keys:
+                    for gram in _grams(key, 2):
+                        bigrams[gram].add(journal_id)
+            self._bigrams = dict(bigrams)
+        return self._bigrams
+
+
+_index = JournalIndex([])
+_built_at: Optional[float] = None
+_refresh_task: Optional[asyncio.Task] = None
+
+
+async def refresh_index() -> JournalIndex:
+    """Rebuild the index from the journals table and swap it in."""
+    global _index, _built_at
+    async with async_session() as session:
+        result = await session.execute(
+            select(Journal.id, Journal.name, Journal.issn, Journal.eissn, Journal.iso_abbreviation, Journal.category)
+        )
+        entries = [JournalEntry(*row) for row in result.all()]
+    # Building takes a moment for a full catalog; keep the event loop free meanwhile
+    _index = await asyncio.to_thread(JournalIndex, entries)
+    _built_at = time.monotonic()
+    return _index
+
+
+async def get_index() -> JournalIndex:
+    """
+    Current index. Built on first use; once older than JOURNAL_INDEX_REFRESH_SECONDS
+    it is rebuilt in the background (picking up changes made by other workers)
+    while the current one keeps serving.
+    """
+    global _refresh_task
+    if _built_at is None:
+        return await refresh_index()
+    is_stale = time.monotonic() - _built_at > settings.JOURNAL_INDEX_REFRESH_SECONDS
+    if is_stale and (_refresh_task is None or _refresh_task.done()):
+        _refresh_task = asyncio.create_task(refresh_index())
+    return _index
@@ -0,0 +1,166 @@
+"""
+In-process metrics exported in the Prometheus text format on /metrics.
+
+Counters and histograms are updated as requests run; stat gauges are read
+from the caches, rate limiter and hash pool when /metrics is scraped.
+Values are per process.
+"""
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Sequence, Tuple
+
+LabelValues = Tuple[str, ...]
+
+# Seconds; covers in-memory work through slow upstream calls
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+_registry: List["_Metric"] = []
+
+
+class _Metric:
+    type = ""
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        _registry.append(self)
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key: LabelValues, extra: str = "") -> str:
+        pairs = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            pairs.append(extra)
+        return "{" + ",".join(pairs) + "}" if pairs else ""
+
+    def render(self) -> List[str]:
+        return [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.type}"] + self._samples()
+
+    def _samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    type = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def _samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_number(v)}" for key, v in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket (+Inf last), sum]
+        self._values: Dict[LabelValues, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1][0] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def _samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                bucket_labels = self._labels(key, f'le="{le}"')
+                lines.append(f"{self.name}_bucket{bucket_labels} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_number(total[0])}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+
+class StatsGauge(_Metric):
+    """Gauge read at scrape time from a stats() dict, one sample per key (label `stat`)."""
+    type = "gauge"
+
+    def __init__(self, name: str, help: str, read: Callable[[], Dict[str, float]]):
+        super().__init__(name, help, ("stat",))
+        self.read = read
+
+    def _samples(self) -> List[str]:
+        return [
+            f"{self.name}{self._labels((stat,))} {_number(value)}"
+            for stat, value in sorted(self.read().items())
+            if isinstance(value, (int, float))
+        ]
+
+
+def render() -> str:
+    """All registered metrics in the Prometheus text exposition format."""
+    lines = []
+    for metric in _registry:
+        lines += metric.render()
+    return "\n".join(lines) + "\n"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+STAGE_SECONDS = Histogram(
+    "medbrief_stage_seconds",
+    "Time spent in each stage of serving a brief",
+    ("stage",),
+)
+UPSTREAM_REQUESTS = Counter(
+    "medbrief_upstream_requests_total",
+    "Requests sent to NCBI E-utilities",
+    ("call",),
+)
+UPSTREAM_ERRORS = Counter(
+    "medbrief_upstream_errors_total",
+    "Failed NCBI E-utilities requests",
+    ("call",),
+)
+RATE_LIMIT_WAIT_SECONDS = Histogram(
+    "medbrief_ncbi_rate_limit_wait_seconds",
+    "Time spent waiting for the NCBI rate limiter",
+)
+BRIEF_ARTICLES = Histogram(
+    "medbrief_brief_articles",
+    "Articles returned per brief",
+    buckets=(0, 10, 25, 50, 100, 250, 500, 1000, 2000, 5000),
+)
+
+
+def span(stage: str):
+    """Time a block as one stage of a brief (`with span("esearch"): ...`)."""
+    return STAGE_SECONDS.time(stage=stage)
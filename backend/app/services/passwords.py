@@ -0,0 +1,93 @@
+"""
+Password hashing off the event loop.
+
+bcrypt is deliberately slow, so hashes and verifications run on a small
+dedicated thread pool (bcrypt releases the GIL) instead of blocking every
+other request while they compute. passlib is imported on first use, keeping
+it out of startup.
+"""
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from typing import Callable, Dict, Optional, Tuple, TypeVar
+
+from app.config import settings
+from app.services.metrics import StatsGauge
+
+T = TypeVar("T")
+
+
+@lru_cache(maxsize=None)
+def pwd_context():
+    """The bcrypt CryptContext, built on first use."""
+    from passlib.context import CryptContext
+
+    # Pinning min/max to the configured cost makes hashes at any other cost "need update",
+    # so changing BCRYPT_ROUNDS re-hashes passwords transparently on next login.
+    return CryptContext(
+        schemes=["bcrypt"],
+        deprecated="auto",
+        bcrypt__default_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__min_rounds=settings.BCRYPT_ROUNDS,
+        bcrypt__max_rounds=settings.BCRYPT_ROUNDS,
+    )
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    thread_name_prefix="password-hash",
+)
+
+
+class HashStats:
+    """Counters for time spent waiting for a hashing thread and hashing."""
+
+    def __init__(self):
+        self.calls = 0
+        self.queue_wait_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.max_queue_wait_seconds = 0.0
+
+    def record(self, queue_wait: float, hash_time: float) -> None:
+        self.calls += 1
+        self.queue_wait_seconds += queue_wait
+        self.hash_seconds += hash_time
+        self.max_queue_wait_seconds = max(self.max_queue_wait_seconds, queue_wait)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "calls": self.calls,
+            "queue_wait_seconds": self.queue_wait_seconds,
+            "hash_seconds": self.hash_seconds,
+            "max_queue_wait_seconds": self.max_queue_wait_seconds,
+        }
+
+
+stats = HashStats()
+StatsGauge("medbrief_password_hashing", "Password hashing pool counters", stats.as_dict)
+
+
+async def hash_password(password: str) -> str:
+    return await _run(lambda: pwd_context().hash(password))
+
+
+async def verify_password(password: str, password_hash: str) -> Tuple[bool, Optional[str]]:
+    """
+    Check a password. Returns (valid, new_hash); new_hash is set when the stored
+    hash uses an outdated cost and should be replaced.
+    """
+    return await _run(lambda: pwd_context().verify_and_update(password, password_hash))
+
+
+async def _run(fn: Callable[[], T]) -> T:
+    submitted = time.perf_counter()
+
+    def timed() -> T:
+        started = time.perf_counter()
+        try:
+            return fn()
+        finally:
+            stats.record(started - submitted, time.perf_counter() - started)
+
+    return await asyncio.get_running_loop().run_in_executor(_executor, timed)
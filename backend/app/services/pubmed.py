@@ -1,157 +1,700 @@
 """
 PubMed Entrez API service for fetching articles.
 """
-import httpx
+import logging
+import time
+import zlib
 from datetime import date
-from typing import List
+from itertools import chain
+from typing import TYPE_CHECKING, AsyncIterator, Callable, Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
 from xml.etree import ElementTree
 import asyncio
 
 from app.config import settings
+from app.services.cache import SingleFlight, TTLCache
+from app.services.disk_cache import DiskCache
+from app.services.metrics import (
+    RATE_LIMIT_WAIT_SECONDS,
+    STAGE_SECONDS,
+    UPSTREAM_ERRORS,
+    UPSTREAM_REQUESTS,
+    StatsGauge,
+    span,
+)
+from app.services.rate_limit import AsyncTokenBucket, SharedRateLimiter
+from app.services.records import ArticleRecord
+from app.services.serialization import dumps, loads
 
-ESEARCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/esearch.fcgi"
-EFETCH_URL = "https://eutils.ncbi.nlm.nih.gov/entrez/eutils/efetch.fcgi"
+if TYPE_CHECKING:
+    import httpx
+
+# Relative to NCBI_EUTILS_BASE_URL, which the shared client uses as its base URL
+ESEARCH_URL = "esearch.fcgi"
+EFETCH_URL = "efetch.fcgi"
+EFETCH_BATCH_SIZE = 100
+
+logger = logging.getLogger(__name__)
+
+# Stand-in for missing XML sections so field lookups simply come back empty
+_EMPTY = ElementTree.Element("empty")
+
+# One limiter for every E-utilities request, shared with the other worker processes
+if settings.NCBI_RATE_LIMIT_PATH:
+    _rate_limiter = SharedRateLimiter(settings.NCBI_RATE_LIMIT_PATH, rate=settings.get_ncbi_rate_limit(), key="ncbi")
+else:
+    _rate_limiter = AsyncTokenBucket(rate=settings.get_ncbi_rate_limit())
+
+
+class PubMedError(Exception):
+    """Raised when PubMed could not be queried completely; carries any articles that were fetched."""
+
+    def __init__(self, message: str, articles: Optional[List[ArticleRecord]] = None):
+        super().__init__(message)
+        self.articles = articles or []
+
+
+class PubMedResult(NamedTuple):
+    articles: List[ArticleRecord]
+    total: int  # Matches reported by ESearch, which may exceed len(articles)
+    truncated: bool  # True when the overall article cap cut the result short
+    attributed: bool  # Every article matched one of the searched ISSNs
+
+
+class PubMedPage(NamedTuple):
+    articles: List[ArticleRecord]  # One EFetch page, in ESearch order
+    total: int
+    truncated: bool
+
+
+CacheKey = Tuple[Tuple[str, ...], date, date]
+
+# Upstream results shared by all requests in this process, keyed by (ISSNs, start, end)
+_result_cache = TTLCache(
+    max_entries=settings.PUBMED_CACHE_MAX_ENTRIES,
+    ttl=settings.PUBMED_CACHE_TTL_SECONDS,
+    max_weight=settings.PUBMED_CACHE_MAX_ARTICLES,
+    weigher=lambda result: len(result.articles),
+)
+_inflight = SingleFlight()
+_background_tasks = set()
+
+# The same results shared with the other worker processes on this host
+_shared_cache = DiskCache(
+    settings.PUBMED_SHARED_CACHE_PATH,
+    ttl=settings.PUBMED_CACHE_TTL_SECONDS,
+    max_bytes=settings.PUBMED_SHARED_CACHE_MAX_MB * 1024 * 1024,
+) if settings.PUBMED_SHARED_CACHE_PATH else None
+_shared_stats = {"from_other_workers": 0, "waits": 0}
+# Bump when the encoded result format changes
+_SHARED_FORMAT = "v1"
+SHARED_POLL_SECONDS = 0.1
+
+# Pooled client shared by every request; created by the first upstream call and
+# closed in the app lifespan (see main.py). httpx is only imported then.
+_client: Optional["httpx.AsyncClient"] = None
+
+
+def create_client() -> "httpx.AsyncClient":
+    """Build the pooled E-utilities client: keep-alive, HTTP/2 when available, gzip."""
+    import httpx
+
+    try:
+        import h2  # noqa: F401 - httpx needs it for HTTP/2
+        http2 = settings.NCBI_HTTP2
+    except ImportError:
+        http2 = False
+    return httpx.AsyncClient(
+        base_url=settings.NCBI_EUTILS_BASE_URL,
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=settings.NCBI_MAX_CONNECTIONS,
+            max_keepalive_connections=settings.NCBI_MAX_CONNECTIONS,
+            keepalive_expiry=60.0,
+        ),
+        timeout=httpx.Timeout(
+            connect=settings.NCBI_CONNECT_TIMEOUT,
+            read=settings.NCBI_READ_TIMEOUT,
+            write=10.0,
+            pool=settings.NCBI_READ_TIMEOUT,
+        ),
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+
+def set_client(client: Optional["httpx.AsyncClient"]) -> None:
+    global _client
+    _client = client
+
+
+def get_client() -> "httpx.AsyncClient":
+    """The shared client, created on first use."""
+    global _client
+    if _client is None or _client.is_closed:
+        _client = create_client()
+    return _client
+
+
+async def close_client() -> None:
+    """Close the shared client, if one was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit/miss/eviction counters for the shared PubMed result cache."""
+    return {**_result_cache.stats(), "coalesced": _inflight.shared}
+
+
+StatsGauge("medbrief_pubmed_cache", "Shared PubMed result cache counters", cache_stats)
+if _shared_cache is not None:
+    StatsGauge(
+        "medbrief_pubmed_shared_cache",
+        "Cross-worker PubMed result cache counters",
+        lambda: {**_shared_cache.stats(), **_shared_stats},
+    )
+StatsGauge("medbrief_ncbi_rate_limiter", "NCBI request rate limiter counters", _rate_limiter.stats)
 
 
 async def fetch_articles_for_journals(
     issns: List[str],
     start_date: date,
     end_date: date,
-) -> List[dict]:
+    raise_on_error: bool = False,
+) -> List[ArticleRecord]:
     """
-    Fetch recent articles from PubMed for the given journal ISSNs.
-    Returns list of article dicts with pmid, title, authors, journal, pub_date, abstract, pubmed_url.
+    Fetch recent articles from PubMed for the given journal ISSNs, as ArticleRecords
+    (which also carry the journal ISSNs/abbreviation and electronic publication date
+    used by the article store).
+
+    Errors are logged and skipped by default; with raise_on_error=True a failed search or
+    batch raises PubMedError so callers can tell an empty result from an incomplete one.
+    See search_articles for the result counts and truncation flag.
+    """
+    try:
+        result = await search_articles(issns, start_date, end_date)
+    except PubMedError as e:
+        if raise_on_error:
+            raise
+        return list(e.articles)
+    return result.articles
+
+
+async def search_articles(
+    issns: List[str],
+    start_date: date,
+    end_date: date,
+) -> PubMedResult:
+    """
+    Search PubMed for the journals' articles in the window, newest first, up to
+    PUBMED_MAX_ARTICLES. Raises PubMedError if the search or any page failed.
+
+    Results are cached per (ISSNs, date window), and concurrent requests for the same
+    journals - or for a subset of journals already being fetched - wait on one upstream fetch.
+    """
+    if not issns:
+        return PubMedResult([], 0, False, True)
+
+    key = _cache_key(issns, start_date, end_date)
+    shared = await _shared_result(key)
+    if shared is not None:
+        return shared
+
+    result = await _inflight.do(key, lambda: _fetch_and_cache(key))
+    return result._replace(articles=list(result.articles))
+
+
+async def iter_search_pages(
+    issns: List[str],
+    start_date: date,
+    end_date: date,
+) -> AsyncIterator[PubMedPage]:
+    """
+    Like search_articles, but yields each EFetch page as soon as it is parsed.
+
+    Cached or already-running searches are yielded as a single page. A failure
+    raises PubMedError after the pages that did arrive have been yielded.
     """
     if not issns:
-        return []
+        return
+
+    key = _cache_key(issns, start_date, end_date)
+    shared = await _shared_result(key)
+    if shared is not None:
+        yield PubMedPage(shared.articles, shared.total, shared.truncated)
+        return
+
+    pages: "asyncio.Queue[PubMedPage]" = asyncio.Queue()
+    # Runs as the shared fetch for this key, so it finishes (and fills the cache)
+    # even if the consumer goes away.
+    task = asyncio.ensure_future(_inflight.do(key, lambda: _fetch_and_cache(key, on_page=pages.put_nowait)))
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+    delivered = False
+    while not task.done() or not pages.empty():
+        if pages.empty():
+            next_page = asyncio.ensure_future(pages.get())
+            await asyncio.wait({next_page, task}, return_when=asyncio.FIRST_COMPLETED)
+            if not next_page.done():
+                next_page.cancel()
+                continue
+            delivered = True
+            yield next_page.result()
+        else:
+            delivered = True
+            yield pages.get_nowait()
+
+    if task.exception() is not None:
+        raise task.exception()
+    if not delivered:
+        # Joined a fetch another caller started, whose pages went to that caller: send its result whole
+        result = task.result()
+        yield PubMedPage(list(result.articles), result.total, result.truncated)
+
+
+async def _shared_result(key: CacheKey) -> Optional[PubMedResult]:
+    """Answer key from the cache or from a running fetch that covers it, if possible."""
+    found = _result_cache.lookup(key, covers=lambda k, r: _covers(key, k, r))
+    if found:
+        return _result_for(key, *found)
+
+    # Piggyback on a running fetch whose journals include ours
+    for other_key in _inflight.inflight_keys():
+        future = _inflight.get(other_key)
+        if future is None or other_key[1:] != key[1:] or not set(key[0]) <= set(other_key[0]):
+            continue
+        try:
+            result = await asyncio.shield(future)
+        except PubMedError:
+            if other_key == key:
+                raise
+            continue  # Another running superset may still succeed
+        if _covers(key, other_key, result):
+            _inflight.shared += 1
+            return _result_for(key, other_key, result)
+
+    # Fetched by another worker
+    if _shared_cache is not None:
+        result = await _load_shared(key)
+        if result is not None:
+            return _result_for(key, key, result)
+    return None
+
+
+def _normalize_issn(issn: str) -> str:
+    return issn.strip().upper()
+
+
+def _cache_key(issns: List[str], start_date: date, end_date: date) -> CacheKey:
+    return (tuple(sorted({_normalize_issn(i) for i in issns if i.strip()})), start_date, end_date)
+
 
+def _covers(key: CacheKey, other_key: CacheKey, result: PubMedResult) -> bool:
+    """Whether a result fetched for other_key can answer key by filtering on ISSN."""
+    if other_key == key:
+        return True
+    return (
+        other_key[1:] == key[1:]
+        and set(key[0]) <= set(other_key[0])
+        and result.attributed
+        and not result.truncated
+    )
+
+
+def _result_for(key: CacheKey, matched_key: CacheKey, result: PubMedResult) -> PubMedResult:
+    if matched_key == key:
+        return result._replace(articles=list(result.articles))
+    wanted = set(key[0])
+    articles = [a for a in result.articles if _article_issns(a) & wanted]
+    return PubMedResult(articles, len(articles), False, True)
+
+
+def _article_issns(article: ArticleRecord) -> set:
+    return {_normalize_issn(i) for i in article.issns}
+
+
+async def _fetch_and_cache(
+    key: CacheKey,
+    on_page: Optional[Callable[[PubMedPage], None]] = None,
+) -> PubMedResult:
+    if _shared_cache is not None:
+        fetched_elsewhere = await _claim_or_wait(key)
+        if fetched_elsewhere is not None:
+            if on_page is not None:
+                on_page(PubMedPage(fetched_elsewhere.articles, fetched_elsewhere.total, fetched_elsewhere.truncated))
+            return fetched_elsewhere
+
+    try:
+        issns, start_date, end_date = key
+        articles, total = await _fetch_from_pubmed(list(issns), start_date, end_date, on_page)
+        wanted = set(issns)
+        result = PubMedResult(
+            articles=articles,
+            total=total,
+            truncated=total > settings.PUBMED_MAX_ARTICLES,
+            attributed=all(_article_issns(a) & wanted for a in articles),
+        )
+        _result_cache.set(key, result)
+        if _shared_cache is not None:
+            await asyncio.to_thread(_shared_cache.set, _shared_key(key), _encode_result(result))
+        return result
+    finally:
+        if _shared_cache is not None:
+            await asyncio.to_thread(_shared_cache.release, _shared_key(key))
+
+
+async def _claim_or_wait(key: CacheKey) -> Optional[PubMedResult]:
+    """
+    Take the cross-worker lease on key, returning None: this process should fetch.
+    While another worker holds it, wait for its result instead (or for the lease
+    to be released or to expire, in which case this process takes over).
+    """
+    shared_key = _shared_key(key)
+    waited = False
+    while True:
+        claimed = await asyncio.to_thread(_shared_cache.acquire, shared_key, settings.PUBMED_SHARED_CACHE_LEASE_SECONDS)
+        # Also checked after claiming: the previous holder may have just stored it
+        result = await _load_shared(key)
+        if result is not None:
+            if claimed:
+                await asyncio.to_thread(_shared_cache.release, shared_key)
+            return result
+        if claimed:
+            return None
+        if not waited:
+            waited = True
+            _shared_stats["waits"] += 1
+        await asyncio.sleep(SHARED_POLL_SECONDS)
+
+
+async def _load_shared(key: CacheKey) -> Optional[PubMedResult]:
+    """Result stored by any worker for exactly key, copied into this process's cache."""
+    data = await asyncio.to_thread(_shared_cache.get, _shared_key(key))
+    if data is None:
+        return None
+    stored_at, result = _decode_result(data)
+    remaining = settings.PUBMED_CACHE_TTL_SECONDS - (time.time() - stored_at)
+    if remaining <= 0:
+        return None
+    # Expire locally when the shared entry does, not a full TTL from now
+    _result_cache.set(key, result, ttl=remaining)
+    _shared_stats["from_other_workers"] += 1
+    return result
+
+
+def _shared_key(key: CacheKey) -> str:
+    issns, start_date, end_date = key
+    return f"{_SHARED_FORMAT}:{','.join(issns)}:{start_date.isoformat()}:{end_date.isoformat()}"
+
+
+def _encode_result(result: PubMedResult) -> bytes:
+    return zlib.compress(dumps({
+        "stored_at": time.time(),
+        "total": result.total,
+        "truncated": result.truncated,
+        "attributed": result.attributed,
+        "articles": [a.to_row() for a in result.articles],
+    }), 1)
+
+
+def _decode_result(data: bytes) -> Tuple[float, PubMedResult]:
+    decoded = loads(zlib.decompress(data))
+    articles = [ArticleRecord.from_row(row) for row in decoded["articles"]]
+    return decoded["stored_at"], PubMedResult(articles, decoded["total"], decoded["truncated"], decoded["attributed"])
+
+
+async def _fetch_from_pubmed(
+    issns: List[str],
+    start_date: date,
+    end_date: date,
+    on_page: Optional[Callable[[PubMedPage], None]] = None,
+) -> Tuple[List[ArticleRecord], int]:
+    """
+    Run ESearch + EFetch for the ISSNs and return (articles, total matches).
+    on_page, if given, receives each page in order as soon as it is available.
+
+    The search is kept on the E-utilities history server and EFetch pages
+    through it with retstart/retmax, so no PMID lists are sent back upstream.
+    Raises PubMedError if anything failed.
+    """
     # Build query: (ISSN1[ISSN] OR ISSN2[ISSN]) AND date_range
     issn_query = " OR ".join([f'"{issn}"[ISSN]' for issn in issns])
     date_range = f'("{start_date.strftime("%Y/%m/%d")}"[PDAT] : "{end_date.strftime("%Y/%m/%d")}"[PDAT])'
     query = f"({issn_query}) AND {date_range}"
 
-    async with httpx.AsyncClient(timeout=60.0) as client:
-        # Step 1: ESearch to get PMIDs (sorted by publication date, newest first)
-        search_params = {
-            "db": "pubmed",
-            "term": query,
-            "retmax": 500,
-            "sort": "pub_date",  # Sort by publication date (newest first)
-            "usehistory": "y",
-            "email": settings.PUBMED_EMAIL,
-            "retmode": "json",
-        }
-        try:
-            search_resp = await client.get(ESEARCH_URL, params=search_params)
+    client = get_client()
+    # Step 1: ESearch, stored on the history server (sorted by publication date, newest first)
+    search_params = {
+        "db": "pubmed",
+        "term": query,
+        "retmax": 0,  # Only the count and history keys are needed
+        "sort": "pub_date",  # Sort by publication date (newest first)
+        "usehistory": "y",
+        "email": settings.PUBMED_EMAIL,
+        "retmode": "json",
+    }
+    try:
+        RATE_LIMIT_WAIT_SECONDS.observe(await _rate_limiter.acquire())
+        UPSTREAM_REQUESTS.inc(call="esearch")
+        with span("esearch"):
+            search_resp = await client.get(ESEARCH_URL, params=_with_api_key(search_params))
+            search_resp.raise_for_status()
             search_data = search_resp.json()
-        except Exception as e:
-            print(f"PubMed search error: {e}")
-            return []
-
-        esearch_result = search_data.get("esearchresult", {})
-        
-        # Check for errors in the response
-        if "error" in esearch_result:
-            print(f"PubMed error: {esearch_result['error']}")
-            return []
-        
-        id_list = esearch_result.get("idlist", [])
-        count = esearch_result.get("count", "0")
-        print(f"PubMed query returned {count} total results, fetching {len(id_list)} articles")
-        
-        if not id_list:
-            return []
-
-        # Rate limit: wait 350ms between requests (< 3/sec)
-        await asyncio.sleep(0.35)
-
-        # Step 2: EFetch to get article details (batch in chunks to avoid URI too long)
-        all_articles = []
-        batch_size = 100
-        
-        for i in range(0, len(id_list), batch_size):
-            batch_ids = id_list[i:i + batch_size]
-            
-            # Rate limit: wait 350ms between requests (<3/sec)
-            if i > 0:
-                await asyncio.sleep(0.35)
-            
-            fetch_params = {
-                "db": "pubmed",
-                "id": ",".join(batch_ids),
-                "rettype": "xml",
-                "email": settings.PUBMED_EMAIL,
-            }
-            try:
-                fetch_resp = await client.get(EFETCH_URL, params=fetch_params)
-                batch_articles = _parse_pubmed_xml(fetch_resp.text)
-                all_articles.extend(batch_articles)
-                print(f"Fetched batch {i//batch_size + 1}: {len(batch_articles)} articles")
-            except Exception as e:
-                print(f"EFetch error for batch {i//batch_size + 1}: {e}")
-                continue  # Continue with other batches even if one fails
-        
-        print(f"Total articles fetched: {len(all_articles)}")
-
-    return all_articles
-
-
-def _parse_pubmed_xml(xml_text: str) -> List[dict]:
-    """Parse PubMed XML response into article dicts."""
-    articles = []
+    except Exception as e:
+        UPSTREAM_ERRORS.inc(call="esearch")
+        logger.warning("PubMed search error: %s", e)
+        raise PubMedError(f"ESearch failed: {e}") from e
+
+    esearch_result = search_data.get("esearchresult", {})
+    
+    # Check for errors in the response
+    if "error" in esearch_result:
+        UPSTREAM_ERRORS.inc(call="esearch")
+        logger.warning("PubMed error: %s", esearch_result["error"])
+        raise PubMedError(f"ESearch error: {esearch_result['error']}")
+
+    total = int(esearch_result.get("count", "0"))
+    webenv = esearch_result.get("webenv")
+    query_key = esearch_result.get("querykey")
+    to_fetch = min(total, settings.PUBMED_MAX_ARTICLES)
+    logger.info("PubMed query returned %d total results, fetching %d articles", total, to_fetch)
+    
+    if not to_fetch:
+        return [], total
+    if not webenv or not query_key:
+        raise PubMedError("ESearch response had no history server keys")
+
+    # Step 2: EFetch pages from the history server. Pages run concurrently;
+    # the shared rate limiter spaces out when each one starts.
+    tasks = [
+        asyncio.ensure_future(
+            _efetch_page(client, webenv, query_key, retstart, min(EFETCH_BATCH_SIZE, to_fetch - retstart))
+        )
+        for retstart in range(0, to_fetch, EFETCH_BATCH_SIZE)
+    ]
+
+    # Reassemble in ESearch order
+    all_articles = []
+    failed_batches = []
+    truncated = total > to_fetch
+    try:
+        for number, task in enumerate(tasks, start=1):
+            batch_articles = await task
+            if batch_articles is None:
+                failed_batches.append(number)
+                continue
+            all_articles.extend(batch_articles)
+            if on_page is not None:
+                on_page(PubMedPage(batch_articles, total, truncated))
+    finally:
+        for task in tasks:
+            task.cancel()
+    
+    logger.info("Total articles fetched: %d", len(all_articles))
+
+    if failed_batches:
+        raise PubMedError(f"EFetch failed for batch(es) {failed_batches}", articles=all_articles)
+    return all_articles, total
+
+
+async def _efetch_page(
+    client: "httpx.AsyncClient",
+    webenv: str,
+    query_key: str,
+    retstart: int,
+    retmax: int,
+) -> Optional[List[ArticleRecord]]:
+    """Fetch and parse one page of a stored search; returns None if it failed."""
+    number = retstart // EFETCH_BATCH_SIZE + 1
+    fetch_params = {
+        "db": "pubmed",
+        "WebEnv": webenv,
+        "query_key": query_key,
+        "retstart": retstart,
+        "retmax": retmax,
+        "rettype": "xml",
+        "email": settings.PUBMED_EMAIL,
+    }
+    try:
+        RATE_LIMIT_WAIT_SECONDS.observe(await _rate_limiter.acquire())
+        UPSTREAM_REQUESTS.inc(call="efetch")
+        batch_articles = []
+        parse_seconds = 0.0
+        with span("efetch"):
+            async with client.stream("GET", EFETCH_URL, params=_with_api_key(fetch_params)) as fetch_resp:
+                fetch_resp.raise_for_status()
+                parser = PubMedStreamParser()
+                async for chunk in fetch_resp.aiter_bytes():
+                    started = time.perf_counter()
+                    batch_articles.extend(parser.feed(chunk))
+                    parse_seconds += time.perf_counter() - started
+                started = time.perf_counter()
+                batch_articles.extend(parser.close())
+                parse_seconds += time.perf_counter() - started
+        # Parsing overlaps the download, so it is recorded as its own stage within efetch
+        STAGE_SECONDS.observe(parse_seconds, stage="parse")
+        logger.debug("Fetched batch %d: %d articles", number, len(batch_articles))
+        return batch_articles
+    except Exception as e:
+        UPSTREAM_ERRORS.inc(call="efetch")
+        logger.warning("EFetch error for batch %d: %s", number, e)
+        return None
+
+
+def _with_api_key(params: dict) -> dict:
+    if settings.NCBI_API_KEY:
+        return {**params, "api_key": settings.NCBI_API_KEY}
+    return params
+
+
+def _parse_pubmed_xml(xml_text: str) -> List[ArticleRecord]:
+    """Parse PubMed XML response into article records."""
     try:
-        root = ElementTree.fromstring(xml_text)
-        for article in root.findall(".//PubmedArticle"):
-            pmid = article.findtext(".//PMID", "")
-            title = article.findtext(".//ArticleTitle", "")
-            journal = article.findtext(".//Journal/Title", "")
-
-            # Authors
-            authors = []
-            for author in article.findall(".//Author"):
-                last = author.findtext("LastName", "")
-                fore = author.findtext("ForeName", "")
-                if last:
-                    authors.append(f"{fore} {last}".strip())
-
-            # Date
-            pub_date_elem = article.find(".//PubDate")
-            if pub_date_elem is not None:
-                year = pub_date_elem.findtext("Year", "")
-                month = pub_date_elem.findtext("Month", "")
-                day = pub_date_elem.findtext("Day", "")
-                pub_date = f"{year}-{month}-{day}".strip("-")
-            else:
-                pub_date = ""
-
-            # Abstract - join all AbstractText elements (for structured abstracts)
-            abstract_parts = []
-            for abs_elem in article.findall(".//AbstractText"):
-                label = abs_elem.get("Label", "")
-                text = abs_elem.text or ""
-                if label:
-                    abstract_parts.append(f"{label}: {text}")
-                else:
-                    abstract_parts.append(text)
-            abstract = " ".join(abstract_parts) if abstract_parts else ""
-
-            # DOI
-            doi = ""
-            for eloc in article.findall(".//ELocationID"):
-                if eloc.get("EIdType") == "doi":
-                    doi = eloc.text or ""
-                    break
-
-            articles.append({
-                "pmid": pmid,
-                "title": title,
-                "authors": authors,
-                "journal": journal,
-                "pub_date": pub_date,
-                "abstract": abstract,
-                "doi": doi,
-                "pubmed_url": f"https://pubmed.ncbi.nlm.nih.gov/{pmid}/",
-            })
+        return list(_iter_pubmed_xml([xml_text.encode("utf-8")]))
     except Exception:
-        pass  # Return empty list on parse error
-    return articles
+        return []  # Return empty list on parse error
+
+
+def _iter_pubmed_xml(chunks: Iterable[bytes]) -> Iterator[ArticleRecord]:
+    """Yield article records from PubMed XML delivered in chunks."""
+    parser = PubMedStreamParser()
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+class PubMedStreamParser:
+    """
+    Incremental PubMed XML parser with memory bounded by one article.
+
+    Feed raw bytes as they arrive; each completed PubmedArticle is converted,
+    yielded and then dropped from the tree.
+    """
+
+    def __init__(self):
+        self._parser = ElementTree.XMLPullParser(events=("start", "end"))
+        self._root = None
+        self._depth = 0
+
+    def feed(self, chunk: bytes) -> Iterator[ArticleRecord]:
+        self._parser.feed(chunk)
+        return self._drain()
+
+    def close(self) -> Iterator[ArticleRecord]:
+        self._parser.close()
+        return self._drain()
+
+    def _drain(self) -> Iterator[ArticleRecord]:
+        for event, elem in self._parser.read_events():
+            if event == "start":
+                if self._root is None:
+                    self._root = elem
+                self._depth += 1
+                continue
+            self._depth -= 1
+            if elem.tag == "PubmedArticle":
+                yield article_from_element(elem)
+            if self._depth == 1:
+                # Top-level record finished: release everything parsed so far
+                self._root.clear()
+
+
+def article_from_element(article: ElementTree.Element) -> ArticleRecord:
+    """Extract the fields we use from one <PubmedArticle> element."""
+    citation = article.find("MedlineCitation")
+    if citation is None:
+        citation = _EMPTY
+    art = citation.find("Article")
+    if art is None:
+        art = _EMPTY
+    journal_elem = art.find("Journal")
+    if journal_elem is None:
+        journal_elem = _EMPTY
+    journal_info = citation.find("MedlineJournalInfo")
+    if journal_info is None:
+        journal_info = _EMPTY
+
+    pmid = citation.findtext("PMID", "")
+    title = art.findtext("ArticleTitle", "")
+    journal = journal_elem.findtext("Title", "")
+    journal_abbrev = journal_info.findtext("MedlineTA", "") or journal_elem.findtext("ISOAbbreviation", "")
+
+    # ISSNs the record is filed under (print/electronic plus the linking ISSN)
+    issns = []
+    for issn_text in (journal_elem.findtext("ISSN", ""), journal_info.findtext("ISSNLinking", "")):
+        if issn_text and issn_text not in issns:
+            issns.append(issn_text)
+
+    # Authors
+    authors = []
+    for author in art.iterfind("AuthorList/Author"):
+        last = author.findtext("LastName", "")
+        fore = author.findtext("ForeName", "")
+        if last:
+            authors.append(f"{fore} {last}".strip())
+
+    # Date
+    pub_date_elem = journal_elem.find("JournalIssue/PubDate")
+    if pub_date_elem is not None:
+        year = pub_date_elem.findtext("Year", "")
+        month = pub_date_elem.findtext("Month", "")
+        day = pub_date_elem.findtext("Day", "")
+        pub_date = f"{year}-{month}-{day}".strip("-")
+    else:
+        pub_date = ""
+
+    # Electronic publication date, if any (YYYY-MM-DD)
+    epub_date = ""
+    article_date = art.find("ArticleDate")
+    if article_date is not None:
+        parts = [article_date.findtext(tag, "") for tag in ("Year", "Month", "Day")]
+        if all(parts):
+            epub_date = "-".join(parts)
+
+    # Abstract - join all AbstractText elements (for structured abstracts),
+    # followed by any OtherAbstract translations
+    abstract_parts = []
+    for abs_elem in chain(art.iterfind("Abstract/AbstractText"), citation.iterfind("OtherAbstract/AbstractText")):
+        label = abs_elem.get("Label", "")
+        text = abs_elem.text or ""
+        if label:
+            abstract_parts.append(f"{label}: {text}")
+        else:
+            abstract_parts.append(text)
+    abstract = " ".join(abstract_parts) if abstract_parts else ""
+
+    # DOI
+    doi = ""
+    for eloc in art.iterfind("ELocationID"):
+        if eloc.get("EIdType") == "doi":
+            doi = eloc.text or ""
+            break
+
+    # Ranking features: publication types and the MeSH headings marked as major topics
+    publication_types = [t.text for t in art.iterfind("PublicationTypeList/PublicationType") if t.text]
+    mesh_major = []
+    for heading in citation.iterfind("MeshHeadingList/MeshHeading"):
+        descriptor = heading.find("DescriptorName")
+        if descriptor is None or not descriptor.text:
+            continue
+        if descriptor.get("MajorTopicYN") == "Y" or any(
+            q.get("MajorTopicYN") == "Y" for q in heading.iterfind("QualifierName")
+        ):
+            mesh_major.append(descriptor.text)
+
+    return ArticleRecord(
+        pmid=pmid,
+        title=title,
+        authors=authors,
+        journal=journal,
+        pub_date=pub_date,
+        abstract=abstract,
+        doi=doi,
+        issns=issns,
+        journal_abbrev=journal_abbrev,
+        epub_date=epub_date,
+        publication_types=publication_types,
+        mesh_major=mesh_major,
+    )
@@ -0,0 +1,181 @@
+"""
+Offline article ingestion from PubMed baseline and update files.
+
+NLM publishes the whole of PubMed as gzipped XML (`pubmed25n0001.xml.gz`, ...)
+plus daily update files in the same format; institutions often mirror them.
+Files are parsed in a process pool, one file per task, with the same field
+extraction as E-utilities responses (`article_from_element`), streaming the
+decompressed XML so memory stays bounded by one record. Only articles from
+journals in the `journals` table are kept. Results are applied in file order:
+each file's articles are upserted in batches, then its <DeleteCitation> PMIDs
+are removed, so a later update file's revisions and deletions win.
+"""
+import asyncio
+import gzip
+import logging
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence, Union
+from xml.etree import ElementTree
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Article, Journal, article_journals
+from app.services.article_store import article_row, publication_date, upsert_articles
+from app.services.clock import utc_now
+from app.services.pubmed import article_from_element
+from app.services.records import ArticleRecord
+
+logger = logging.getLogger(__name__)
+
+INGEST_BATCH_SIZE = 2000
+
+# ISSN -> journal id, set in each pool worker by _init_worker
+_worker_journals: Dict[str, int] = {}
+
+
+@dataclass
+class IngestReport:
+    files: int = 0
+    parsed: int = 0  # PubmedArticle records read
+    upserted: int = 0  # Records from catalog journals, inserted or updated
+    deleted: int = 0  # PMIDs named by DeleteCitation
+    parse_seconds: float = 0.0  # CPU time spent parsing, summed over workers
+    wall_seconds: float = 0.0
+
+    @property
+    def articles_per_second(self) -> float:
+        return self.parsed / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def articles_per_core_second(self) -> float:
+        """Parsing throughput of one core."""
+        return self.parsed / self.parse_seconds if self.parse_seconds else 0.0
+
+
+class ParsedFile(NamedTuple):
+    path: str
+    parsed: int
+    # (ArticleRecord.to_row(), journal id) for the articles to keep; rows pickle cheaply
+    articles: List[tuple]
+    deleted: List[int]
+    cpu_seconds: float
+
+
+def parse_file(path: Union[str, Path], journals: Optional[Dict[str, int]] = None) -> ParsedFile:
+    """Parse one (optionally gzipped) PubMed XML file, keeping articles whose ISSN is in `journals`."""
+    journals = _worker_journals if journals is None else journals
+    started = time.process_time()
+    parsed = 0
+    articles = []
+    deleted = []
+    opener = gzip.open if str(path).endswith(".gz") else open
+    with opener(path, "rb") as f:
+        events = ElementTree.iterparse(f, events=("start", "end"))
+        _, root = next(events)
+        for event, elem in events:
+            if event != "end":
+                continue
+            if elem.tag == "PubmedArticle":
+                parsed += 1
+                record = article_from_element(elem)
+                journal_id = _journal_id(record, journals)
+                if journal_id is not None and record.pmid.isdigit():
+                    articles.append((record.to_row(), journal_id))
+                root.clear()  # Finished records are not needed again
+            elif elem.tag == "DeleteCitation":
+                deleted.extend(int(pmid.text) for pmid in elem.iterfind("PMID") if (pmid.text or "").isdigit())
+                root.clear()
+    return ParsedFile(str(path), parsed, articles, deleted, time.process_time() - started)
+
+
+def _journal_id(record: ArticleRecord, journals: Dict[str, int]) -> Optional[int]:
+    for issn in record.issns:
+        journal_id = journals.get(issn.upper())
+        if journal_id is not None:
+            return journal_id
+    return None
+
+
+def _init_worker(journals: Dict[str, int]) -> None:
+    global _worker_journals
+    _worker_journals = journals
+
+
+async def load_journal_issns(db: AsyncSession) -> Dict[str, int]:
+    """Print and electronic ISSNs of every journal, mapped to the journal id."""
+    result = await db.execute(select(Journal.id, Journal.issn, Journal.eissn))
+    journals: Dict[str, int] = {}
+    for journal_id, issn, eissn in result.all():
+        for value in (issn, eissn):
+            if value:
+                journals[value.upper()] = journal_id
+    return journals
+
+
+async def ingest_files(
+    db: AsyncSession,
+    paths: Sequence[Union[str, Path]],
+    workers: Optional[int] = None,
+    batch_size: int = INGEST_BATCH_SIZE,
+) -> IngestReport:
+    """Parse the files across `workers` processes (default: all cores) and apply them in order."""
+    report = IngestReport()
+    started = time.perf_counter()
+    journals = await load_journal_issns(db)
+    if not journals:
+        logger.warning("No journals in the database; nothing would be kept. Import the catalog first.")
+        return report
+
+    workers = workers or os.cpu_count() or 1
+    loop = asyncio.get_running_loop()
+    remaining = iter(paths)
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(journals,)) as pool:
+        # Keep every worker busy while bounding how many parsed files wait in memory
+        pending = deque()
+        for path in remaining:
+            pending.append(loop.run_in_executor(pool, parse_file, path))
+            if len(pending) >= workers * 2:
+                break
+        while pending:
+            parsed = await pending.popleft()
+            next_path = next(remaining, None)
+            if next_path is not None:
+                pending.append(loop.run_in_executor(pool, parse_file, next_path))
+            await _apply(db, parsed, batch_size, report)
+            logger.info(
+                "%s: %d articles, %d kept, %d deleted",
+                Path(parsed.path).name, parsed.parsed, len(parsed.articles), len(parsed.deleted),
+            )
+
+    report.wall_seconds = time.perf_counter() - started
+    return report
+
+
+async def _apply(db: AsyncSession, parsed: ParsedFile, batch_size: int, report: IngestReport) -> None:
+    fetched_at = utc_now()
+    for i in range(0, len(parsed.articles), batch_size):
+        article_rows = []
+        link_rows = []
+        for row, journal_id in parsed.articles[i:i + batch_size]:
+            record = ArticleRecord.from_row(row)
+            article_rows.append(article_row(record, publication_date(record), fetched_at))
+            link_rows.append({"journal_id": journal_id, "article_pmid": int(record.pmid)})
+        await upsert_articles(db, article_rows, link_rows)
+
+    for i in range(0, len(parsed.deleted), batch_size):
+        pmids = parsed.deleted[i:i + batch_size]
+        await db.execute(delete(article_journals).where(article_journals.c.article_pmid.in_(pmids)))
+        await db.execute(delete(Article).where(Article.pmid.in_(pmids)))
+
+    await db.commit()
+    report.files += 1
+    report.parsed += parsed.parsed
+    report.upserted += len(parsed.articles)
+    report.deleted += len(parsed.deleted)
+    report.parse_seconds += parsed.cpu_seconds
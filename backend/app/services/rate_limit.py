@@ -0,0 +1,130 @@
+"""
+Async rate limiters: a token bucket for one process, and a slot booker that
+keeps every worker process on the host within one combined rate.
+"""
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+
+class AsyncTokenBucket:
+    """
+    Allow `rate` acquisitions per second with bursts of up to `capacity`.
+
+    Waiters are served in arrival order: the lock is held while a caller sleeps
+    for its token, so a later caller can never overtake an earlier one.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else 1.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock: Optional[asyncio.Lock] = None
+        self.acquired = 0
+        self.total_wait = 0.0
+
+    async def acquire(self) -> float:
+        """Take one token, sleeping until one is available. Returns seconds waited."""
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        started = time.monotonic()
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        return waited
+
+    def stats(self) -> Dict[str, float]:
+        return {"rate": self.rate, "acquired": self.acquired, "total_wait_seconds": self.total_wait}
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+
+class SharedRateLimiter:
+    """
+    Allow `rate` acquisitions per second across all processes using the same
+    SQLite file at `path`: each acquisition books the next free slot, 1/rate
+    seconds after the previous one, and sleeps until it. If the file cannot be
+    used, falls back to a per-process token bucket at the same rate.
+    """
+
+    def __init__(self, path: str, rate: float, key: str = "default"):
+        self.path = path
+        self.rate = rate
+        self._key = key
+        self._fallback = AsyncTokenBucket(rate)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_pid: Optional[int] = None
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.total_wait = 0.0
+        self.errors = 0
+
+    async def acquire(self) -> float:
+        """Take the next slot, sleeping until it comes. Returns seconds waited."""
+        started = time.monotonic()
+        delay = await asyncio.to_thread(self._reserve)
+        if delay is None:
+            await self._fallback.acquire()
+        elif delay > 0:
+            await asyncio.sleep(delay)
+        waited = time.monotonic() - started
+        self.acquired += 1
+        self.total_wait += waited
+        return waited
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "rate": self.rate,
+            "acquired": self.acquired,
+            "total_wait_seconds": self.total_wait,
+            "errors": self.errors,
+        }
+
+    def _reserve(self) -> Optional[float]:
+        """Book the next slot; returns seconds until it, or None if the file is unusable."""
+        with self._lock:
+            try:
+                conn = self._connect()
+                conn.execute("BEGIN IMMEDIATE")
+                try:
+                    now = time.time()
+                    row = conn.execute("SELECT next_at FROM slots WHERE key = ?", (self._key,)).fetchone()
+                    slot = max(now, row[0]) if row else now
+                    conn.execute(
+                        "INSERT OR REPLACE INTO slots (key, next_at) VALUES (?, ?)",
+                        (self._key, slot + 1 / self.rate),
+                    )
+                    conn.execute("COMMIT")
+                except BaseException:
+                    conn.execute("ROLLBACK")
+                    raise
+                return slot - now
+            except sqlite3.Error as e:
+                self.errors += 1
+                self._conn = None
+                print(f"Rate limiter: {self.path} unusable, limiting this process only: {e}")
+                return None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections are not shared with forked workers
+        if self._conn is not None and self._conn_pid == os.getpid():
+            return self._conn
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("CREATE TABLE IF NOT EXISTS slots (key TEXT PRIMARY KEY, next_at REAL NOT NULL)")
+        self._conn = conn
+        self._conn_pid = os.getpid()
+        return conn
@@ -0,0 +1,84 @@
+"""
+Compact in-memory article record shared by the PubMed client, the article
+store and the briefs API.
+"""
+import sys
+from typing import Iterable, Optional
+
+PUBMED_URL = "https://pubmed.ncbi.nlm.nih.gov/{}/"
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+class ArticleRecord:
+    """
+    One article. Caches and brief snapshots hold many thousands of these, so
+    the record is slotted, journal names and ISSNs are interned (a brief repeats
+    a handful of journals), authors are a tuple and pubmed_url is derived from
+    the PMID on demand. `to_dict` gives the ArticleOut shape.
+    """
+
+    __slots__ = (
+        "pmid", "title", "authors", "journal", "pub_date", "abstract", "doi",
+        "issns", "journal_abbrev", "epub_date", "publication_types", "mesh_major",
+    )
+
+    def __init__(
+        self,
+        pmid: str,
+        title: str,
+        authors: Iterable[str] = (),
+        journal: str = "",
+        pub_date: str = "",
+        abstract: Optional[str] = "",
+        doi: Optional[str] = "",
+        issns: Iterable[str] = (),
+        journal_abbrev: str = "",
+        epub_date: str = "",
+        publication_types: Iterable[str] = (),
+        mesh_major: Iterable[str] = (),
+    ):
+        self.pmid = pmid
+        self.title = title
+        self.authors = tuple(authors)
+        self.journal = _intern(journal)
+        self.pub_date = pub_date
+        self.abstract = abstract
+        self.doi = doi
+        # Parsed-record extras used to attribute and date articles when storing them
+        self.issns = tuple(_intern(issn) for issn in issns)
+        self.journal_abbrev = _intern(journal_abbrev)
+        self.epub_date = epub_date
+        # Ranking features (see app.services.ranking); a small vocabulary, so interned too
+        self.publication_types = tuple(_intern(t) for t in publication_types)
+        self.mesh_major = tuple(_intern(t) for t in mesh_major)
+
+    @property
+    def pubmed_url(self) -> str:
+        return PUBMED_URL.format(self.pmid)
+
+    def to_dict(self) -> dict:
+        """The briefs API shape (ArticleOut)."""
+        return {
+            "pmid": self.pmid,
+            "title": self.title,
+            "authors": list(self.authors),
+            "journal": self.journal,
+            "pub_date": self.pub_date,
+            "abstract": self.abstract,
+            "doi": self.doi,
+            "pubmed_url": self.pubmed_url,
+        }
+
+    def to_row(self) -> list:
+        """Every field, in constructor order, for compact serialization (see from_row)."""
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_row(cls, row: list) -> "ArticleRecord":
+        return cls(*row)
+
+    def __repr__(self) -> str:
+        return f"ArticleRecord(pmid={self.pmid!r}, title={self.title!r})"
@@ -0,0 +1,140 @@
+"""
+Full-text search over stored articles (title, abstract, authors).
+
+SQLite uses an FTS5 external-content table kept in sync by triggers;
+Postgres uses a generated tsvector column with a GIN index. Either way the
+index follows every insert/upsert into `articles`, so it updates as briefs
+fetch new articles.
+"""
+import logging
+import re
+from typing import List
+
+from sqlalchemy import bindparam, select, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncSession
+
+from app.database import engine
+from app.models import Article, article_journals
+from app.services.article_store import article_to_record
+from app.services.records import ArticleRecord
+
+logger = logging.getLogger(__name__)
+
+_SQLITE_FTS_DDL = [
+    """CREATE VIRTUAL TABLE articles_fts USING fts5(
+        title, abstract, authors, content='articles', content_rowid='pmid'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ai AFTER INSERT ON articles BEGIN
+        INSERT INTO articles_fts(rowid, title, abstract, authors)
+        VALUES (new.pmid, new.title, new.abstract, new.authors);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_ad AFTER DELETE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, abstract, authors)
+        VALUES ('delete', old.pmid, old.title, old.abstract, old.authors);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS articles_fts_au AFTER UPDATE ON articles BEGIN
+        INSERT INTO articles_fts(articles_fts, rowid, title, abstract, authors)
+        VALUES ('delete', old.pmid, old.title, old.abstract, old.authors);
+        INSERT INTO articles_fts(rowid, title, abstract, authors)
+        VALUES (new.pmid, new.title, new.abstract, new.authors);
+    END""",
+]
+
+_POSTGRES_FTS_DDL = [
+    """ALTER TABLE articles ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A')
+            || setweight(to_tsvector('english', coalesce(abstract, '')), 'B')
+            || setweight(to_tsvector('simple', coalesce(authors::text, '')), 'C')
+        ) STORED""",
+    "CREATE INDEX IF NOT EXISTS ix_articles_search_vector ON articles USING GIN (search_vector)",
+]
+
+# Falls back to LIKE matching if this SQLite build lacks FTS5
+_fts_available = True
+
+
+async def ensure_search_index(conn: AsyncConnection) -> None:
+    """Create the full-text index for the active database if it does not exist yet."""
+    global _fts_available
+    if conn.dialect.name == "postgresql":
+        for statement in _POSTGRES_FTS_DDL:
+            await conn.execute(text(statement))
+        return
+
+    result = await conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"))
+    if result.first():
+        return
+    try:
+        for statement in _SQLITE_FTS_DDL:
+            await conn.execute(text(statement))
+    except OperationalError as e:
+        logger.warning("Full-text search unavailable, using LIKE matching: %s", e)
+        _fts_available = False
+        return
+    # Index articles stored before the FTS table existed
+    await conn.execute(text("INSERT INTO articles_fts(articles_fts) VALUES ('rebuild')"))
+
+
+async def detect_search_index(conn: AsyncConnection) -> None:
+    """Check whether the full-text index exists, without creating it (for a schema known to be current)."""
+    global _fts_available
+    if conn.dialect.name == "sqlite":
+        result = await conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'articles_fts'"))
+        _fts_available = result.first() is not None
+
+
+async def search_articles(
+    db: AsyncSession,
+    journal_ids: List[int],
+    query: str,
+    limit: int = 20,
+) -> List[ArticleRecord]:
+    """Articles from the journals matching the query, best match first."""
+    terms = re.findall(r"\w+", query)
+    if not journal_ids or not terms:
+        return []
+
+    if engine.dialect.name == "postgresql":
+        stmt = text("""
+            SELECT a.pmid FROM articles a
+            WHERE a.search_vector @@ websearch_to_tsquery('english', :query)
+              AND a.pmid IN (SELECT article_pmid FROM article_journals WHERE journal_id IN :journal_ids)
+            ORDER BY ts_rank_cd(a.search_vector, websearch_to_tsquery('english', :query)) DESC
+            LIMIT :limit
+        """)
+        params = {"query": query, "journal_ids": journal_ids, "limit": limit}
+    elif _fts_available:
+        # Quote every term so user input can't be read as FTS5 query syntax
+        stmt = text("""
+            SELECT articles_fts.rowid AS pmid FROM articles_fts
+            WHERE articles_fts MATCH :query
+              AND articles_fts.rowid IN (SELECT article_pmid FROM article_journals WHERE journal_id IN :journal_ids)
+            ORDER BY bm25(articles_fts, 10.0, 1.0, 2.0)
+            LIMIT :limit
+        """)
+        params = {"query": " ".join(f'"{t}"' for t in terms), "journal_ids": journal_ids, "limit": limit}
+    else:
+        return await _search_like(db, journal_ids, terms, limit)
+
+    result = await db.execute(stmt.bindparams(bindparam("journal_ids", expanding=True)), params)
+    pmids = [row.pmid for row in result]
+    if not pmids:
+        return []
+
+    rows = await db.execute(select(Article).where(Article.pmid.in_(pmids)))
+    by_pmid = {a.pmid: a for a in rows.scalars().all()}
+    return [article_to_record(by_pmid[p]) for p in pmids if p in by_pmid]
+
+
+async def _search_like(db: AsyncSession, journal_ids: List[int], terms: List[str], limit: int) -> List[ArticleRecord]:
+    stmt = select(Article).where(
+        Article.pmid.in_(
+            select(article_journals.c.article_pmid).where(article_journals.c.journal_id.in_(journal_ids))
+        )
+    )
+    for term in terms:
+        stmt = stmt.where(Article.title.ilike(f"%{term}%") | Article.abstract.ilike(f"%{term}%"))
+    result = await db.execute(stmt.order_by(Article.published_on.desc()).limit(limit))
+    return [article_to_record(a) for a in result.scalars().all()]
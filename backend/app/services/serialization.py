@@ -0,0 +1,37 @@
+"""
+Fast JSON encoding for brief responses.
+
+ArticleRecords reaching the briefs API come from our own parser or the article
+store and always have the ArticleOut shape, so they are encoded directly
+rather than validated again item by item. orjson is used when it is
+installed; otherwise the standard library encoder.
+"""
+import json
+from typing import Any
+
+from app.services.records import ArticleRecord
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(value: Any) -> bytes:
+    """Encode JSON data, which may contain ArticleRecords, as compact UTF-8."""
+    if orjson is not None:
+        return orjson.dumps(value, default=_default)
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=_default).encode("utf-8")
+
+
+def loads(data: bytes) -> Any:
+    """Decode JSON produced by dumps."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, ArticleRecord):
+        return value.to_dict()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,127 @@
+"""
+Short-lived server-side snapshots of generated briefs, paged with opaque cursors.
+
+The request for a cursor may reach any worker process, so snapshots are stored
+in the `brief_snapshots` table; each worker also keeps the ones it has served
+in memory until they expire.
+"""
+import base64
+import binascii
+import json
+import secrets
+import time
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.models import StoredSnapshot
+from app.services.cache import TTLCache
+from app.services.metrics import StatsGauge
+from app.services.records import ArticleRecord
+from app.services.serialization import dumps
+
+# Far more than any snapshot holds; longer offsets are rejected before int()
+MAX_OFFSET_DIGITS = 9
+
+
+class BriefSnapshot(NamedTuple):
+    user_id: int
+    articles: List[ArticleRecord]
+    truncated: bool
+
+
+class SnapshotStore:
+    """Snapshots in the database, with an in-process cache in front of them."""
+
+    def __init__(self):
+        self._local = TTLCache(
+            max_entries=settings.BRIEF_SNAPSHOT_MAX_ENTRIES,
+            ttl=settings.BRIEF_SNAPSHOT_TTL_SECONDS,
+            max_weight=settings.BRIEF_SNAPSHOT_MAX_ARTICLES,
+            weigher=lambda snapshot: len(snapshot.articles),
+        )
+
+    async def create(self, db: AsyncSession, user_id: int, articles: List[ArticleRecord], truncated: bool) -> str:
+        """Store a brief and return its snapshot id."""
+        snapshot_id = secrets.token_urlsafe(12)
+        now = time.time()
+        # Expired snapshots are dropped as new ones are written
+        await db.execute(delete(StoredSnapshot).where(StoredSnapshot.expires_at <= now))
+        db.add(StoredSnapshot(
+            id=snapshot_id,
+            user_id=user_id,
+            truncated=truncated,
+            articles=zlib.compress(dumps(articles), 1),
+            expires_at=now + settings.BRIEF_SNAPSHOT_TTL_SECONDS,
+        ))
+        await db.commit()
+        self._local.set(snapshot_id, BriefSnapshot(user_id, articles, truncated))
+        return snapshot_id
+
+    async def get(self, db: AsyncSession, snapshot_id: str, user_id: int) -> Optional[BriefSnapshot]:
+        """Return the user's snapshot, or None if it expired or belongs to someone else."""
+        snapshot = self._local.get(snapshot_id)
+        if snapshot is None:
+            snapshot = await self._load(db, snapshot_id)
+        if snapshot is None or snapshot.user_id != user_id:
+            return None
+        return snapshot
+
+    async def _load(self, db: AsyncSession, snapshot_id: str) -> Optional[BriefSnapshot]:
+        """Snapshot created by any worker, copied into this process's cache."""
+        result = await db.execute(
+            select(StoredSnapshot)
+            .where(StoredSnapshot.id == snapshot_id, StoredSnapshot.expires_at > time.time())
+        )
+        row = result.scalar_one_or_none()
+        if row is None:
+            return None
+        articles = [_record(a) for a in json.loads(zlib.decompress(row.articles))]
+        snapshot = BriefSnapshot(row.user_id, articles, row.truncated)
+        # Expire locally when the stored row does, not a full TTL from now
+        self._local.set(snapshot_id, snapshot, ttl=row.expires_at - time.time())
+        return snapshot
+
+    def stats(self) -> Dict[str, int]:
+        """Counters for the in-process cache."""
+        return self._local.stats()
+
+
+def _record(article: dict) -> ArticleRecord:
+    """Rebuild a record from its stored ArticleOut shape (pubmed_url is derived)."""
+    return ArticleRecord(**{k: v for k, v in article.items() if k != "pubmed_url"})
+
+
+_store = SnapshotStore()
+StatsGauge("medbrief_brief_snapshots", "Brief snapshot cache counters", _store.stats)
+
+
+async def create_snapshot(db: AsyncSession, user_id: int, articles: List[ArticleRecord], truncated: bool) -> str:
+    """Store a brief and return its snapshot id."""
+    return await _store.create(db, user_id, articles, truncated)
+
+
+async def get_snapshot(db: AsyncSession, snapshot_id: str, user_id: int) -> Optional[BriefSnapshot]:
+    """Return the user's snapshot, or None if it expired or belongs to someone else."""
+    return await _store.get(db, snapshot_id, user_id)
+
+
+def encode_cursor(snapshot_id: str, offset: int) -> str:
+    return base64.urlsafe_b64encode(f"{snapshot_id}:{offset}".encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[Tuple[str, int]]:
+    """Return (snapshot_id, offset), or None if the cursor is malformed."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        snapshot_id, offset = raw.rsplit(":", 1)
+    except (ValueError, binascii.Error, UnicodeDecodeError):
+        return None
+    # Only offsets we could have issued: plain non-negative digits (int() would also
+    # take "-3" or " 1_0"), short enough to stay a sane slice index
+    if not offset.isascii() or not offset.isdigit() or len(offset) > MAX_OFFSET_DIGITS:
+        return None
+    return snapshot_id, int(offset)
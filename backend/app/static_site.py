@@ -0,0 +1,145 @@
+"""
+Static serving for the built frontend.
+
+The build directory is indexed once at startup: every file gets its content
+type, a content-hash ETag and, for text assets, gzip/brotli variants (taken
+from precompressed `.gz`/`.br` files next to it, or compressed once in
+memory). Small files are kept in memory, so requests never touch the
+filesystem. Vite's content-hashed files under /assets are cached by
+browsers for a year; everything else, notably index.html, is revalidated
+with If-None-Match.
+"""
+import gzip
+import hashlib
+import mimetypes
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from starlette.requests import Request
+from starlette.responses import FileResponse, Response
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+IMMUTABLE_PREFIX = "assets/"
+IMMUTABLE_CACHE = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE = "no-cache"
+
+# Files up to this size are held in memory (the SPA shell and typical bundles)
+MAX_MEMORY_BYTES = 1024 * 1024
+# Compressing tiny files saves nothing
+MIN_COMPRESS_BYTES = 1024
+COMPRESSIBLE_TYPES = ("text/", "application/javascript", "application/json", "image/svg+xml", "application/xml")
+
+Body = Union[bytes, Path]
+
+
+@dataclass
+class StaticFile:
+    content_type: str
+    etag: str
+    cache_control: str
+    # Encoding ("identity", "br", "gzip") -> content in memory or on disk
+    bodies: Dict[str, Body] = field(default_factory=dict)
+
+
+class StaticSite:
+    def __init__(self, root: Path):
+        self.root = root
+        self.files: Dict[str, StaticFile] = {}
+        for path in sorted(root.rglob("*")):
+            if not path.is_file() or path.suffix in (".gz", ".br"):
+                continue
+            relative = path.relative_to(root).as_posix()
+            self.files[relative] = _index_file(path, relative)
+        self.index = self.files.get("index.html")
+
+    def serve(self, relative_path: str, request: Request) -> Optional[Response]:
+        """Response for a path under the root, the SPA shell for unknown routes, or None."""
+        static_file = self.files.get(relative_path)
+        if static_file is None:
+            if relative_path.startswith(IMMUTABLE_PREFIX):
+                return None  # A missing hashed asset must 404, not turn into index.html
+            static_file = self.index
+        if static_file is None:
+            return None
+
+        encoding = _choose_encoding(request.headers.get("accept-encoding", ""), static_file.bodies)
+        headers = {"ETag": _variant_etag(static_file.etag, encoding), "Cache-Control": static_file.cache_control}
+        if len(static_file.bodies) > 1:
+            headers["Vary"] = "Accept-Encoding"
+        if _etag_matches(request.headers.get("if-none-match"), static_file):
+            return Response(status_code=304, headers=headers)
+
+        body = static_file.bodies[encoding]
+        if encoding != "identity":
+            headers["Content-Encoding"] = encoding
+        if isinstance(body, Path):
+            return FileResponse(body, media_type=static_file.content_type, headers=headers)
+        return Response(body, media_type=static_file.content_type, headers=headers)
+
+
+def _index_file(path: Path, relative: str) -> StaticFile:
+    content_type = mimetypes.guess_type(path.name)[0] or "application/octet-stream"
+    size = path.stat().st_size
+    content = path.read_bytes() if size <= MAX_MEMORY_BYTES else None
+    digest = hashlib.blake2b(content if content is not None else path.read_bytes(), digest_size=12).hexdigest()
+
+    static_file = StaticFile(
+        content_type=content_type,
+        etag=f'"{digest}"',
+        cache_control=IMMUTABLE_CACHE if relative.startswith(IMMUTABLE_PREFIX) else REVALIDATE_CACHE,
+    )
+    static_file.bodies["identity"] = content if content is not None else path
+
+    compressible = content_type.startswith(COMPRESSIBLE_TYPES) and size >= MIN_COMPRESS_BYTES
+    for encoding, suffix, compress in (("br", ".br", _brotli), ("gzip", ".gz", _gzip)):
+        precompressed = path.with_name(path.name + suffix)
+        if precompressed.is_file():
+            static_file.bodies[encoding] = _load(precompressed)
+        elif compressible and content is not None and compress is not None:
+            compressed = compress(content)
+            if len(compressed) < size:
+                static_file.bodies[encoding] = compressed
+    return static_file
+
+
+def _load(path: Path) -> Body:
+    return path.read_bytes() if path.stat().st_size <= MAX_MEMORY_BYTES else path
+
+
+def _gzip(content: bytes) -> bytes:
+    return gzip.compress(content, compresslevel=9, mtime=0)
+
+
+_brotli = (lambda content: brotli.compress(content, quality=11)) if brotli is not None else None
+
+
+def _choose_encoding(accept_encoding: str, bodies: Dict[str, Body]) -> str:
+    accepted = set()
+    for part in accept_encoding.lower().split(","):
+        name, _, params = part.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.strip())
+    for encoding in ("br", "gzip"):
+        if encoding in bodies and (encoding in accepted or "*" in accepted):
+            return encoding
+    return "identity"
+
+
+def _variant_etag(etag: str, encoding: str) -> str:
+    """Each encoded representation gets its own strong ETag."""
+    return etag if encoding == "identity" else f'{etag[:-1]}-{encoding}"'
+
+
+def _etag_matches(if_none_match: Optional[str], static_file: StaticFile) -> bool:
+    """Any representation's ETag revalidates: the content behind them is the same."""
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    if "*" in candidates:
+        return True
+    return any(_variant_etag(static_file.etag, encoding) in candidates for encoding in static_file.bodies)
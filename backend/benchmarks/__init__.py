@@ -0,0 +1,4 @@
+"""
+Benchmarks and load tests for the brief pipeline. Run from backend/, e.g.
+`python -m benchmarks.parse_bench` or `python -m benchmarks.load_test`.
+"""
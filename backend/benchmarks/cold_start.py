@@ -0,0 +1,145 @@
+"""
+Cold-start report: import time and time to the first healthy response.
+
+    python -m benchmarks.cold_start --repeat 5 --output cold.json
+    python -m benchmarks.cold_start --schema-mode sync --compare cold.json
+
+`imports` runs `python -X importtime -c "import main"` in a fresh interpreter
+and reports the total, each module main imports directly and the third-party
+packages costing the most.
+
+`boot` starts uvicorn on a temporary SQLite database and polls /health until
+it answers: `first` boots on an empty database, `restart` boots again on the
+same one, which is what redeploys and scale-from-zero pay.
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from pathlib import Path
+from typing import Dict, List
+
+from benchmarks import report
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+POLL_INTERVAL = 0.005
+BOOT_TIMEOUT = 60.0
+
+
+def import_profile(env: Dict[str, str], top: int) -> Dict[str, Dict[str, float]]:
+    """
+    Cumulative import time (ms) of `main`, of each module it imports directly
+    and of the most expensive third-party packages. A package's time includes
+    whatever it pulled in that was not loaded yet.
+    """
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import main"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    entries = []  # (depth, name, cumulative microseconds), children listed before their parent
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if cumulative.strip().isdigit():  # Skips the header line
+            entries.append(((len(name) - len(name.lstrip())) // 2, name.strip(), int(cumulative)))
+
+    rows: Dict[str, Dict[str, float]] = {}
+    main_at = next(i for i, (depth, name, _) in enumerate(entries) if depth == 0 and name == "main")
+    rows["main"] = {"cumulative_ms": round(entries[main_at][2] / 1000, 1)}
+    children = []
+    for depth, name, microseconds in reversed(entries[:main_at]):
+        if depth == 0:
+            break
+        if depth == 1:
+            children.append((name, microseconds))
+    for name, microseconds in reversed(children):
+        rows[f"main > {name}"] = {"cumulative_ms": round(microseconds / 1000, 1)}
+
+    packages = [
+        (name, microseconds) for _, name, microseconds in entries
+        if "." not in name and name not in sys.stdlib_module_names and not name.startswith("_") and name not in ("app", "main")
+    ]
+    for name, microseconds in sorted(packages, key=lambda item: -item[1])[:top]:
+        rows[f"package {name}"] = {"cumulative_ms": round(microseconds / 1000, 1)}
+    return rows
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def time_to_healthy(env: Dict[str, str]) -> float:
+    """Seconds from spawning uvicorn until /health returns 200."""
+    port = _free_port()
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+    )
+    try:
+        while time.perf_counter() - started < BOOT_TIMEOUT:
+            if process.poll() is not None:
+                raise RuntimeError(f"Server exited during startup:\n{process.stderr.read().decode()}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return time.perf_counter() - started
+            except OSError:
+                time.sleep(POLL_INTERVAL)
+        raise RuntimeError(f"/health did not answer within {BOOT_TIMEOUT}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def boot_times(env: Dict[str, str], repeat: int) -> Dict[str, Dict[str, float]]:
+    samples: Dict[str, List[float]] = {"first": [], "restart": []}
+    for _ in range(repeat):
+        workdir = tempfile.mkdtemp(prefix="medbrief-coldstart-")
+        run_env = {**env, "DATABASE_URL": f"sqlite+aiosqlite:///{workdir}/cold.db"}
+        samples["first"].append(time_to_healthy(run_env))
+        samples["restart"].append(time_to_healthy(run_env))
+    return {
+        name: {
+            "median_ms": round(statistics.median(values) * 1000, 1),
+            "min_ms": round(min(values) * 1000, 1),
+            "max_ms": round(max(values) * 1000, 1),
+        }
+        for name, values in samples.items()
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure import time and time to first healthy response.")
+    parser.add_argument("--repeat", type=int, default=5, help="Boots per scenario")
+    parser.add_argument("--top", type=int, default=12, help="Packages to list in the import profile")
+    parser.add_argument("--schema-mode", choices=["check", "sync"], default="check", help="SCHEMA_STARTUP_MODE")
+    parser.add_argument("--output", help="Save results as JSON")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    env = {**os.environ, "SCHEMA_STARTUP_MODE": args.schema_mode, "LOG_LEVEL": "WARNING"}
+    result = {
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare")},
+        "imports": import_profile(env, args.top),
+        "boot": boot_times(env, args.repeat),
+    }
+    report.print_table("imports", result["imports"])
+    report.print_table("boot", result["boot"])
+    if args.compare:
+        report.compare(args.compare, result, "imports", ["cumulative_ms"])
+        report.compare(args.compare, result, "boot", ["median_ms", "min_ms"])
+    if args.output:
+        report.save(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+Database latency for the hot per-user queries at realistic table sizes.
+
+    python -m benchmarks.db_bench --users 100000 --output db.json
+    python -m benchmarks.db_bench --users 100000 --no-indexes --no-wal --compare db.json
+
+Seeds a temporary SQLite database (or --database-url) with users, profiles and
+a catalog-sized journal table, then times the router code for profile listing
+and preset lookups, plus profile creation while other users list concurrently
+(--writers, --concurrency). --no-indexes drops the profile and category indexes
+after seeding, and --no-wal uses SQLite's rollback journal, to reproduce the
+schema and engine settings from before they were added.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from typing import Awaitable, Callable, Dict, List
+
+from benchmarks import report
+
+CATEGORIES = ["Cardiology", "Medicine", "Oncology", "Neurology", "Pediatrics", "Surgery", "Psychiatry", "Infectious Disease"]
+INSERT_CHUNK = 10_000
+DROPPED_INDEXES = ("ix_profiles_user_id", "ix_journals_category_lower", "ix_profile_journals_journal_id")
+
+
+async def seed(args) -> None:
+    from app.database import Base, engine
+    from app.models import Journal, Profile, User, profile_journals
+
+    rng = random.Random(args.seed)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+        journals = [
+            {"id": i, "name": f"Journal {i}", "issn": f"{i:04d}-{i % 9973:04d}",
+             "category": CATEGORIES[i % len(CATEGORIES)] if i <= len(CATEGORIES) * 10 else None}
+            for i in range(1, args.journals + 1)
+        ]
+        await _insert(conn, Journal.__table__, journals)
+        await _insert(conn, User.__table__, [
+            {"id": i, "email": f"user{i}@bench.test", "password_hash": "x"} for i in range(1, args.users + 1)
+        ])
+        profiles = []
+        links = []
+        for user_id in range(1, args.users + 1):
+            for _ in range(args.profiles):
+                profile_id = len(profiles) + 1
+                profiles.append({"id": profile_id, "name": "Brief", "user_id": user_id})
+                for journal_id in rng.sample(range(1, args.journals + 1), args.journals_per_profile):
+                    links.append({"profile_id": profile_id, "journal_id": journal_id})
+        await _insert(conn, Profile.__table__, profiles)
+        await _insert(conn, profile_journals, links)
+
+        if args.no_indexes:
+            for name in DROPPED_INDEXES:
+                await conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
+        if engine.dialect.name == "sqlite":
+            await conn.exec_driver_sql("ANALYZE")
+
+
+async def _insert(conn, table, rows: List[dict]) -> None:
+    for i in range(0, len(rows), INSERT_CHUNK):
+        await conn.execute(table.insert(), rows[i:i + INSERT_CHUNK])
+
+
+async def timed(samples: List[float], call: Callable[[], Awaitable]) -> None:
+    started = time.perf_counter()
+    await call()
+    samples.append(time.perf_counter() - started)
+
+
+async def run(args) -> dict:
+    workdir = tempfile.mkdtemp(prefix="medbrief-dbbench-")
+    # Settings are read at import time, so configure the app before importing it
+    os.environ["DATABASE_URL"] = args.database_url or f"sqlite+aiosqlite:///{workdir}/bench.db"
+    os.environ["SQLITE_WAL"] = "false" if args.no_wal else "true"
+    from app.database import async_session, engine
+    from app.routers.auth import Principal
+    from app.routers.journals import get_preset_journals
+    from app.routers.profiles import ProfileCreate, create_profile, list_profiles
+
+    started = time.perf_counter()
+    await seed(args)
+    seed_seconds = time.perf_counter() - started
+
+    rng = random.Random(args.seed + 1)
+    rows: Dict[str, Dict[str, float]] = {}
+
+    async def list_for_random_user():
+        user_id = rng.randint(1, args.users)
+        async with async_session() as db:
+            await list_profiles(current_user=Principal(id=user_id, email=""), db=db)
+
+    async def preset_lookup():
+        async with async_session() as db:
+            await get_preset_journals(category=rng.choice(CATEGORIES).lower(), db=db)
+
+    async def create_for_random_user():
+        user_id = rng.randint(1, args.users)
+        data = ProfileCreate(name="Bench", journal_ids=rng.sample(range(1, args.journals + 1), args.journals_per_profile))
+        async with async_session() as db:
+            await create_profile(data=data, current_user=Principal(id=user_id, email=""), db=db)
+
+    for name, call in (("profiles_list", list_for_random_user), ("preset_query", preset_lookup)):
+        samples: List[float] = []
+        started = time.perf_counter()
+        for _ in range(args.iterations):
+            await timed(samples, call)
+        rows[name] = report.summarize(samples, 0, time.perf_counter() - started)
+
+    # Writers and readers at once: without WAL, readers wait for each commit
+    reads: List[float] = []
+    writes: List[float] = []
+    errors = {"read": 0, "write": 0}
+
+    async def worker(kind: str, samples: List[float], call):
+        for _ in range(args.iterations // args.concurrency or 1):
+            try:
+                await timed(samples, call)
+            except Exception:
+                errors[kind] += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(
+        *[worker("write", writes, create_for_random_user) for _ in range(args.writers)],
+        *[worker("read", reads, list_for_random_user) for _ in range(args.concurrency - args.writers)],
+    )
+    mixed_seconds = time.perf_counter() - started
+    rows["mixed_create"] = report.summarize(writes, errors["write"], mixed_seconds)
+    rows["mixed_list"] = report.summarize(reads, errors["read"], mixed_seconds)
+
+    await engine.dispose()
+    return {
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "database_url")},
+        "seed_seconds": round(seed_seconds, 2),
+        "db": rows,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profile and preset queries at scale.")
+    parser.add_argument("--users", type=int, default=100_000)
+    parser.add_argument("--profiles", type=int, default=1, help="Profiles per user")
+    parser.add_argument("--journals", type=int, default=30_000, help="Journals (a full NLM catalog is ~30k)")
+    parser.add_argument("--journals-per-profile", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=20, help="Tasks in the mixed read/write phase")
+    parser.add_argument("--writers", type=int, default=5, help="Of --concurrency, how many create profiles")
+    parser.add_argument("--no-indexes", action="store_true", help="Drop the profile/category indexes after seeding")
+    parser.add_argument("--no-wal", action="store_true", help="SQLite rollback journal instead of WAL")
+    parser.add_argument("--database-url", help="Empty database to use instead of a temporary SQLite file")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Save results as JSON")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args))
+    print(f"seeded in {result['seed_seconds']}s")
+    report.print_table("db", result["db"])
+    if args.compare:
+        report.compare(args.compare, result, "db", ["p50_ms", "p95_ms", "p99_ms", "rps"])
+    if args.output:
+        report.save(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
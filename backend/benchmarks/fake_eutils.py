@@ -0,0 +1,155 @@
+"""
+Local fake of the NCBI E-utilities endpoints the app uses (ESearch with the
+history server, EFetch by WebEnv/query_key).
+
+Every journal gets `per_day` articles per day with stable PMIDs, rendered
+from the recorded fixtures. Latency and error injection are configurable and
+seeded, so runs are repeatable. Standalone:
+
+    python -m benchmarks.fake_eutils --port 8765 --latency 0.05 --error-rate 0.01
+
+then start the app with NCBI_EUTILS_BASE_URL=http://127.0.0.1:8765/.
+"""
+import argparse
+import asyncio
+import random
+import re
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from typing import Iterator, List
+
+import uvicorn
+from fastapi import FastAPI, Request, Response
+from fastapi.responses import JSONResponse
+
+from benchmarks.fixtures import Record, load_templates, record_pmid, render_efetch
+
+_ISSN_TERM = re.compile(r'"([0-9]{4}-[0-9]{3}[0-9Xx])"\[ISSN\]')
+_DATE_TERM = re.compile(r'"(\d{4}/\d{2}/\d{2})"\[PDAT\]')
+
+# Searches kept on the fake history server
+MAX_SEARCHES = 10_000
+
+
+class FakeEUtils:
+    def __init__(
+        self,
+        per_day: int = 2,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        seed: int = 0,
+    ):
+        self.per_day = per_day
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.random = random.Random(seed)
+        self.templates = load_templates()
+        self.searches: "OrderedDict[str, List[Record]]" = OrderedDict()
+        self.calls: Counter = Counter()
+
+    def search(self, term: str) -> List[Record]:
+        """Articles matching an ESearch term, newest first."""
+        issns = _ISSN_TERM.findall(term)
+        dates = [datetime.strptime(d, "%Y/%m/%d").date() for d in _DATE_TERM.findall(term)]
+        start, end = (min(dates), max(dates)) if dates else (date.today(), date.today())
+        records = []
+        day = end
+        while day >= start:
+            for issn in issns:
+                records += [Record(record_pmid(issn, day, n), issn, day) for n in range(self.per_day)]
+            day -= timedelta(days=1)
+        return records
+
+    async def respond_slowly(self, endpoint: str) -> bool:
+        """Apply latency; returns False when this call should fail."""
+        self.calls[endpoint] += 1
+        delay = self.latency + self.random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.calls[f"{endpoint}_errors"] += 1
+            return False
+        return True
+
+
+def create_app(fake: FakeEUtils) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/esearch.fcgi")
+    async def esearch(request: Request):
+        if not await fake.respond_slowly("esearch"):
+            return Response(status_code=fake.error_status)
+        records = fake.search(request.query_params.get("term", ""))
+        webenv = uuid.uuid4().hex
+        fake.searches[webenv] = records
+        while len(fake.searches) > MAX_SEARCHES:
+            fake.searches.popitem(last=False)
+        retmax = int(request.query_params.get("retmax", 20))
+        return JSONResponse({"esearchresult": {
+            "count": str(len(records)),
+            "retmax": str(min(retmax, len(records))),
+            "retstart": "0",
+            "querykey": "1",
+            "webenv": webenv,
+            "idlist": [str(r.pmid) for r in records[:retmax]],
+        }})
+
+    @app.get("/efetch.fcgi")
+    async def efetch(request: Request):
+        if not await fake.respond_slowly("efetch"):
+            return Response(status_code=fake.error_status)
+        records = fake.searches.get(request.query_params.get("WebEnv", ""))
+        if records is None:
+            return Response("Unable to obtain query #1", status_code=400)
+        retstart = int(request.query_params.get("retstart", 0))
+        retmax = int(request.query_params.get("retmax", 20))
+        body = render_efetch(records[retstart:retstart + retmax], fake.templates)
+        return Response(body, media_type="text/xml")
+
+    return app
+
+
+@contextmanager
+def running(fake: FakeEUtils, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+    """Serve the fake on a background thread; yields its base URL."""
+    server = uvicorn.Server(uvicorn.Config(create_app(fake), host=host, port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            raise RuntimeError("Fake E-utilities server failed to start")
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    try:
+        yield f"http://{host}:{port}/"
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--per-day", type=int, default=2, help="Articles per journal per day")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random latency, up to this many seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of calls that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    fake = FakeEUtils(args.per_day, args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+    uvicorn.run(create_app(fake), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+PubMed fixtures for benchmarks.
+
+Recorded EFetch articles in fixtures/ serve as templates: synthetic responses
+of any size are built by copying them round-robin and rewriting the PMID,
+ISSN and publication date of each copy.
+"""
+import copy
+import zlib
+from datetime import date
+from pathlib import Path
+from typing import Iterable, List, NamedTuple, Optional
+from xml.etree import ElementTree
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+EFETCH_FIXTURE = FIXTURES_DIR / "efetch_sample.xml"
+
+_MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+
+class Record(NamedTuple):
+    pmid: int
+    issn: str
+    published: date
+
+
+def load_templates(path: Path = EFETCH_FIXTURE) -> List[ElementTree.Element]:
+    """PubmedArticle elements from a recorded EFetch response."""
+    return ElementTree.parse(path).getroot().findall("PubmedArticle")
+
+
+def record_pmid(issn: str, published: date, n: int) -> int:
+    """Stable PMID for the n-th synthetic article of a journal on a day."""
+    return 30_000_000 + zlib.crc32(f"{issn}:{published}:{n}".encode()) % 10_000_000
+
+
+def render_efetch(records: Iterable[Record], templates: Optional[List[ElementTree.Element]] = None) -> bytes:
+    """EFetch XML for the records, one templated PubmedArticle each."""
+    templates = templates or load_templates()
+    root = ElementTree.Element("PubmedArticleSet")
+    for i, record in enumerate(records):
+        root.append(_render_article(templates[i % len(templates)], record))
+    return b'<?xml version="1.0" ?>\n' + ElementTree.tostring(root, encoding="utf-8")
+
+
+def synthetic_efetch(count: int, issn: str = "0028-4793", published: date = date(2025, 1, 15)) -> bytes:
+    """EFetch XML with `count` articles from one journal and day."""
+    return render_efetch(Record(record_pmid(issn, published, n), issn, published) for n in range(count))
+
+
+def _render_article(template: ElementTree.Element, record: Record) -> ElementTree.Element:
+    article = copy.deepcopy(template)
+    citation = article.find("MedlineCitation")
+    citation.find("PMID").text = str(record.pmid)
+
+    journal = citation.find("Article/Journal")
+    issn = journal.find("ISSN")
+    if issn is None:
+        issn = ElementTree.Element("ISSN", IssnType="Print")
+        journal.insert(0, issn)
+    issn.text = record.issn
+
+    info = citation.find("MedlineJournalInfo")
+    if info is None:
+        info = ElementTree.SubElement(citation, "MedlineJournalInfo")
+    linking = info.find("ISSNLinking")
+    if linking is None:
+        linking = ElementTree.SubElement(info, "ISSNLinking")
+    linking.text = record.issn
+
+    issue = journal.find("JournalIssue")
+    if issue is None:
+        issue = ElementTree.SubElement(journal, "JournalIssue")
+    pub_date = issue.find("PubDate")
+    if pub_date is not None:
+        issue.remove(pub_date)
+    pub_date = ElementTree.SubElement(issue, "PubDate")
+    ElementTree.SubElement(pub_date, "Year").text = str(record.published.year)
+    ElementTree.SubElement(pub_date, "Month").text = _MONTHS[record.published.month - 1]
+    ElementTree.SubElement(pub_date, "Day").text = f"{record.published.day:02d}"
+
+    # The electronic date would otherwise take precedence over the rewritten one
+    for article_date in citation.findall("Article/ArticleDate"):
+        citation.find("Article").remove(article_date)
+    for article_id in article.findall("PubmedData/ArticleIdList/ArticleId"):
+        if article_id.get("IdType") == "pubmed":
+            article_id.text = str(record.pmid)
+    return article
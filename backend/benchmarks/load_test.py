@@ -0,0 +1,163 @@
+"""
+End-to-end load test of the brief pipeline against the fake E-utilities server.
+
+    python -m benchmarks.load_test --users 20 --concurrency 10 --iterations 3 --output run.json
+    python -m benchmarks.load_test ... --compare run.json
+
+Runs the app in-process on a fresh temporary SQLite database, seeds journals,
+creates N synthetic users with profiles, then has every user repeatedly log in,
+list profiles and generate each profile's brief, with at most `concurrency`
+users active at once. Reports p50/p95/p99 latency and requests/s per endpoint,
+plus the upstream calls the fake server received. Everything is seeded, so
+runs with the same arguments do the same work.
+"""
+import argparse
+import asyncio
+import os
+import random
+import tempfile
+import time
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+import httpx
+
+from benchmarks import report
+from benchmarks.fake_eutils import FakeEUtils, running
+
+
+class Recorder:
+    def __init__(self):
+        self.samples: Dict[str, List[float]] = defaultdict(list)
+        self.errors: Dict[str, int] = defaultdict(int)
+
+    async def request(self, client: httpx.AsyncClient, name: str, method: str, url: str, **kwargs) -> httpx.Response:
+        started = time.perf_counter()
+        response = await client.request(method, url, **kwargs)
+        self.samples[name].append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[name] += 1
+        return response
+
+    def summary(self, wall_seconds: float) -> Dict[str, Dict[str, float]]:
+        rows = {name: report.summarize(s, self.errors[name], wall_seconds) for name, s in self.samples.items()}
+        every = [x for s in self.samples.values() for x in s]
+        rows["all"] = report.summarize(every, sum(self.errors.values()), wall_seconds)
+        return rows
+
+
+async def setup_users(client: httpx.AsyncClient, args, recorder: Recorder) -> List[Tuple[str, str]]:
+    """Seed journals and create users with profiles; returns (email, password) per user."""
+    response = await client.post("/seed")
+    response.raise_for_status()
+    journal_ids = sorted({
+        j["id"]
+        for category in ("cardiology", "medicine")
+        for j in (await client.get(f"/api/journals/presets/{category}")).json()
+    })
+    rng = random.Random(args.seed)
+    users = [(f"bench{i}@example.com", f"bench-password-{i}") for i in range(args.users)]
+
+    async def create(email: str, password: str, picks: List[List[int]]):
+        response = await recorder.request(client, "register", "POST", "/auth/register",
+                                          json={"email": email, "password": password})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        for n, ids in enumerate(picks):
+            await recorder.request(client, "create_profile", "POST", "/api/profiles/",
+                                   json={"name": f"Profile {n}", "journal_ids": ids}, headers=headers)
+
+    per_profile = min(args.journals_per_profile, len(journal_ids))
+    picks = [[rng.sample(journal_ids, per_profile) for _ in range(args.profiles)] for _ in users]
+    await _bounded(args.concurrency, [create(email, password, p) for (email, password), p in zip(users, picks)])
+    return users
+
+
+async def run_user(client: httpx.AsyncClient, args, recorder: Recorder, email: str, password: str):
+    for _ in range(args.iterations):
+        response = await recorder.request(client, "login", "POST", "/auth/login",
+                                          data={"username": email, "password": password})
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        profiles = (await recorder.request(client, "profiles", "GET", "/api/profiles/", headers=headers)).json()
+        for profile in profiles:
+            await recorder.request(client, "generate", "GET", "/api/briefs/generate",
+                                   params={"profile_id": profile["id"], "days": args.days}, headers=headers)
+
+
+async def _bounded(limit: int, coros) -> None:
+    semaphore = asyncio.Semaphore(limit)
+
+    async def run(coro):
+        async with semaphore:
+            await coro
+
+    await asyncio.gather(*(run(c) for c in coros))
+
+
+async def run(args) -> dict:
+    # Settings are read at import time, so configure the app before importing it
+    workdir = tempfile.mkdtemp(prefix="medbrief-bench-")
+    os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{workdir}/bench.db"
+    os.environ["PUBMED_SHARED_CACHE_PATH"] = f"{workdir}/pubmed_cache.db"
+    os.environ["NCBI_RATE_LIMIT_PATH"] = f"{workdir}/ncbi_rate_limit.db"
+    os.environ["NCBI_EUTILS_BASE_URL"] = args.eutils_url
+    os.environ["NCBI_RATE_LIMIT"] = str(args.ncbi_rate)
+    os.environ["BCRYPT_ROUNDS"] = str(args.bcrypt_rounds)
+    from main import app, lifespan
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=None) as client:
+            setup = Recorder()
+            started = time.perf_counter()
+            users = await setup_users(client, args, setup)
+            setup_seconds = time.perf_counter() - started
+
+            load = Recorder()
+            started = time.perf_counter()
+            await _bounded(args.concurrency, [run_user(client, args, load, e, p) for e, p in users])
+            load_seconds = time.perf_counter() - started
+
+    return {
+        "config": {k: v for k, v in vars(args).items() if k not in ("output", "compare", "eutils_url")},
+        "setup": setup.summary(setup_seconds),
+        "load": load.summary(load_seconds),
+        "wall_seconds": round(load_seconds, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test login, profiles and brief generation.")
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--profiles", type=int, default=2, help="Profiles per user")
+    parser.add_argument("--journals-per-profile", type=int, default=5)
+    parser.add_argument("--iterations", type=int, default=3, help="Login/profiles/briefs rounds per user")
+    parser.add_argument("--concurrency", type=int, default=10, help="Users active at once")
+    parser.add_argument("--days", type=int, default=7)
+    parser.add_argument("--per-day", type=int, default=2, help="Fake articles per journal per day")
+    parser.add_argument("--latency", type=float, default=0.05, help="Fake E-utilities latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fake E-utilities failure rate")
+    parser.add_argument("--ncbi-rate", type=float, default=0, help="Upstream requests/s (0 = NCBI default)")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="Save results as JSON")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    fake = FakeEUtils(args.per_day, args.latency, args.jitter, args.error_rate, seed=args.seed)
+    with running(fake) as url:
+        args.eutils_url = url
+        result = asyncio.run(run(args))
+    result["upstream_calls"] = dict(fake.calls)
+
+    report.print_table("setup", result["setup"])
+    report.print_table("load", result["load"])
+    print(f"\nUpstream calls: {result['upstream_calls']}")
+    if args.compare:
+        report.compare(args.compare, result, "load", ["p50_ms", "p95_ms", "p99_ms", "rps"])
+    if args.output:
+        report.save(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Microbenchmark for PubMed XML parsing: articles/s and memory per batch size.
+
+    python -m benchmarks.parse_bench --sizes 10 100 1000 --repeat 5 --output parse.json
+
+`whole` parses a complete response with _parse_pubmed_xml; `stream` feeds the
+same bytes to PubMedStreamParser in 64 KiB chunks, as EFetch responses arrive.
+Peak traced memory (allocation high-water mark while parsing) and retained
+memory (what the parsed records keep alive) are measured on a separate run so
+tracing doesn't skew timing.
+"""
+import argparse
+import gc
+import resource
+import statistics
+import time
+import tracemalloc
+from typing import Callable, Dict
+
+from app.services.pubmed import PubMedStreamParser, _parse_pubmed_xml
+from benchmarks import report
+from benchmarks.fixtures import synthetic_efetch
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _parse_whole(xml: bytes) -> list:
+    return _parse_pubmed_xml(xml.decode("utf-8"))
+
+
+def _parse_stream(xml: bytes) -> list:
+    parser = PubMedStreamParser()
+    articles = []
+    for i in range(0, len(xml), CHUNK_SIZE):
+        articles.extend(parser.feed(xml[i:i + CHUNK_SIZE]))
+    articles.extend(parser.close())
+    return articles
+
+
+MODES: Dict[str, Callable[[bytes], list]] = {"whole": _parse_whole, "stream": _parse_stream}
+
+
+def bench(parse: Callable[[bytes], list], xml: bytes, expected: int, repeat: int) -> Dict[str, float]:
+    timings = []
+    for _ in range(repeat):
+        gc.collect()
+        started = time.perf_counter()
+        count = len(parse(xml))
+        timings.append(time.perf_counter() - started)
+        if count != expected:
+            raise RuntimeError(f"Parsed {count} articles, expected {expected}")
+
+    gc.collect()
+    tracemalloc.start()
+    articles = parse(xml)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del articles
+
+    median = statistics.median(timings)
+    return {
+        "articles": expected,
+        "xml_kib": round(len(xml) / 1024, 1),
+        "median_ms": round(median * 1000, 2),
+        "articles_per_s": round(expected / median),
+        "peak_traced_kib": round(peak / 1024, 1),
+        "retained_kib": round(retained / 1024, 1),
+        # Linux reports KiB; process-wide high-water mark so far (sizes run smallest first)
+        "max_rss_mib": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PubMed XML parsing.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 500, 2000], help="Articles per response")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--modes", nargs="+", choices=list(MODES), default=list(MODES))
+    parser.add_argument("--output", help="Save results as JSON")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    rows = {}
+    for size in sorted(args.sizes):
+        xml = synthetic_efetch(size)
+        for mode in args.modes:
+            rows[f"{mode}/{size}"] = bench(MODES[mode], xml, size, args.repeat)
+
+    result = {"config": vars(args), "parse": rows}
+    report.print_table("parse", rows)
+    if args.compare:
+        report.compare(args.compare, result, "parse", ["median_ms", "articles_per_s", "peak_traced_kib", "retained_kib"])
+    if args.output:
+        report.save(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
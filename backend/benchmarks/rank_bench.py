@@ -0,0 +1,91 @@
+"""
+CPU cost of ranking a brief with `sort=signal`, per brief size.
+
+    python -m benchmarks.rank_bench --sizes 50 500 2000 5000 --output rank.json
+
+`numpy` is the vectorized scorer, `python` the fallback used when NumPy is not
+installed; both must produce the same order. Articles are parsed from synthetic
+EFetch XML, then given a seeded mix of publication types, MeSH major topics,
+abstracts, journal weights and dates across a --days window.
+"""
+import argparse
+import random
+import statistics
+import time
+from datetime import date, timedelta
+from typing import Dict, List
+
+from app.services import ranking
+from app.services.pubmed import _parse_pubmed_xml
+from app.services.records import ArticleRecord
+from benchmarks import report
+from benchmarks.fixtures import synthetic_efetch
+
+END_DATE = date(2025, 1, 31)
+PUBLICATION_TYPES = list(ranking.EVIDENCE_LEVELS) + ["Journal Article"] * 20
+
+
+def make_articles(count: int, days: int, seed: int) -> tuple:
+    rng = random.Random(seed)
+    articles = _parse_pubmed_xml(synthetic_efetch(count).decode("utf-8"))
+    for article in articles:
+        article.publication_types = tuple(rng.sample(PUBLICATION_TYPES, rng.randint(1, 3)))
+        article.mesh_major = tuple(f"Topic {n}" for n in range(rng.randint(0, 5)))
+        article.abstract = article.abstract if rng.random() < 0.8 else ""
+        article.epub_date = (END_DATE - timedelta(days=rng.randrange(days))).isoformat()
+    weights = {a.pmid: rng.choice([ranking.DEFAULT_JOURNAL_WEIGHT, ranking.CURATED_JOURNAL_WEIGHT,
+                                   ranking.SPECIALTY_JOURNAL_WEIGHT]) for a in articles}
+    return articles, weights
+
+
+def bench(articles: List[ArticleRecord], weights: Dict[str, float], start_date: date, vectorized: bool,
+          repeat: int) -> dict:
+    cpu, wall = [], []
+    for _ in range(repeat):
+        started_cpu, started_wall = time.process_time(), time.perf_counter()
+        ranked = ranking.rank_articles(articles, weights, start_date, END_DATE, vectorized)
+        cpu.append(time.process_time() - started_cpu)
+        wall.append(time.perf_counter() - started_wall)
+    return {
+        "articles": len(articles),
+        "cpu_ms": round(statistics.median(cpu) * 1000, 3),
+        "wall_ms": round(statistics.median(wall) * 1000, 3),
+        "order": [a.pmid for a in ranked],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark signal ranking of briefs.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 2000, 5000], help="Articles per brief")
+    parser.add_argument("--days", type=int, default=30, help="Brief window")
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", help="Save results as JSON")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    has_numpy = ranking.numpy_module() is not None
+    modes = {"numpy": True, "python": False} if has_numpy else {"python": False}
+    start_date = END_DATE - timedelta(days=args.days)
+    rows = {}
+    for size in args.sizes:
+        articles, weights = make_articles(size, args.days, args.seed)
+        orders = set()
+        for mode, vectorized in modes.items():
+            row = bench(articles, weights, start_date, vectorized, args.repeat)
+            orders.add(tuple(row.pop("order")))
+            rows[f"{mode}/{size}"] = row
+        if len(orders) > 1:
+            raise RuntimeError(f"NumPy and Python rankings differ for {size} articles")
+
+    result = {"config": vars(args), "numpy": has_numpy, "rank": rows}
+    report.print_table("rank", rows)
+    print(f"\nnumpy: {'yes' if result['numpy'] else 'no (pure Python fallback only)'}")
+    if args.compare:
+        report.compare(args.compare, result, "rank", ["cpu_ms", "wall_ms"])
+    if args.output:
+        report.save(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
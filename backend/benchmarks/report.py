@@ -0,0 +1,64 @@
+"""
+Latency summaries and run-to-run comparison for benchmark results.
+"""
+import json
+import math
+from pathlib import Path
+from typing import Dict, List, Optional
+
+
+def percentile(sorted_samples: List[float], p: float) -> float:
+    """Nearest-rank percentile of already sorted samples."""
+    if not sorted_samples:
+        return 0.0
+    rank = max(1, math.ceil(p / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples: List[float], errors: int, wall_seconds: float) -> Dict[str, float]:
+    """Latency percentiles (ms) and throughput for one endpoint."""
+    ordered = sorted(samples)
+    return {
+        "requests": len(ordered),
+        "errors": errors,
+        "p50_ms": round(percentile(ordered, 50) * 1000, 2),
+        "p95_ms": round(percentile(ordered, 95) * 1000, 2),
+        "p99_ms": round(percentile(ordered, 99) * 1000, 2),
+        "max_ms": round((ordered[-1] if ordered else 0.0) * 1000, 2),
+        "rps": round(len(ordered) / wall_seconds, 2) if wall_seconds else 0.0,
+    }
+
+
+def print_table(title: str, rows: Dict[str, Dict[str, float]]) -> None:
+    columns = list(next(iter(rows.values())).keys()) if rows else []
+    width = max([len(name) for name in rows] + [len(title)])
+    print(f"\n{title:<{width}}  " + "  ".join(f"{c:>10}" for c in columns))
+    for name, row in rows.items():
+        print(f"{name:<{width}}  " + "  ".join(f"{row[c]:>10}" for c in columns))
+
+
+def save(path: str, result: dict) -> None:
+    Path(path).write_text(json.dumps(result, indent=2))
+    print(f"\nSaved results to {path}")
+
+
+def compare(baseline_path: str, result: dict, section: str, metrics: Optional[List[str]] = None) -> None:
+    """Print the change of each metric in result[section] against a saved run."""
+    baseline = json.loads(Path(baseline_path).read_text()).get(section, {})
+    rows = {}
+    for name, row in result[section].items():
+        before = baseline.get(name)
+        if before is None:
+            continue
+        rows[name] = {
+            metric: _change(before.get(metric), row[metric])
+            for metric in (metrics or row) if isinstance(row[metric], (int, float))
+        }
+    if rows:
+        print_table(f"vs {Path(baseline_path).name}", rows)
+
+
+def _change(before: Optional[float], after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
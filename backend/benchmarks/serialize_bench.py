@@ -0,0 +1,104 @@
+"""
+CPU cost of encoding a brief response, per brief size.
+
+    python -m benchmarks.serialize_bench --sizes 50 500 2000 --output serialize.json
+
+`response_model` reproduces what FastAPI does for `response_model=List[ArticleOut]`
+on ready-made article dicts (validate every item, dump to JSON-compatible data,
+encode with the json module); `fast` is the briefs router's path, encoding
+ArticleRecords with app.services.serialization.dumps.
+Articles carry abstracts of about --abstract-chars characters.
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import Callable, Dict, List, Tuple
+
+from pydantic import TypeAdapter
+
+from app.routers.briefs import ArticleOut
+from app.services import serialization
+from app.services.pubmed import _parse_pubmed_xml
+from app.services.records import ArticleRecord
+from benchmarks import report
+from benchmarks.fixtures import synthetic_efetch
+
+_article_list = TypeAdapter(List[ArticleOut])
+
+
+def _response_model(articles: List[dict]) -> bytes:
+    validated = _article_list.validate_python(articles)
+    content = _article_list.dump_python(validated, mode="json")
+    # Starlette's JSONResponse.render
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode("utf-8")
+
+
+def _fast(articles: List[ArticleRecord]) -> bytes:
+    return serialization.dumps(articles)
+
+
+# Mode name -> (encoder, whether it takes dicts rather than records)
+MODES: Dict[str, Tuple[Callable[[list], bytes], bool]] = {
+    "response_model": (_response_model, True),
+    "fast": (_fast, False),
+}
+
+
+def make_articles(count: int, abstract_chars: int) -> List[ArticleRecord]:
+    articles = _parse_pubmed_xml(synthetic_efetch(count).decode("utf-8"))
+    for article in articles:
+        abstract = article.abstract or "Abstract text."
+        article.abstract = (abstract + " ") * (abstract_chars // (len(abstract) + 1) + 1)
+    return articles
+
+
+def bench(encode: Callable[[list], bytes], articles: list, repeat: int) -> Dict[str, float]:
+    cpu, wall = [], []
+    for _ in range(repeat):
+        started_cpu, started_wall = time.process_time(), time.perf_counter()
+        body = encode(articles)
+        cpu.append(time.process_time() - started_cpu)
+        wall.append(time.perf_counter() - started_wall)
+    return {
+        "articles": len(articles),
+        "body_kib": round(len(body) / 1024, 1),
+        "cpu_ms": round(statistics.median(cpu) * 1000, 3),
+        "wall_ms": round(statistics.median(wall) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark brief response serialization.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 2000], help="Articles per brief")
+    parser.add_argument("--abstract-chars", type=int, default=1500)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--output", help="Save results as JSON")
+    parser.add_argument("--compare", help="JSON from an earlier run to compare against")
+    args = parser.parse_args()
+
+    rows = {}
+    for size in args.sizes:
+        records = make_articles(size, args.abstract_chars)
+        dicts = [a.to_dict() for a in records]
+        baseline = json.loads(_response_model(dicts))
+        for mode, (encode, takes_dicts) in MODES.items():
+            articles = dicts if takes_dicts else records
+            if json.loads(encode(articles)) != baseline:
+                raise RuntimeError(f"{mode} output differs from response_model output")
+            rows[f"{mode}/{size}"] = bench(encode, articles, args.repeat)
+        slow, fast = rows[f"response_model/{size}"], rows[f"fast/{size}"]
+        slow["cpu_saving"] = "-"
+        fast["cpu_saving"] = f"{1 - fast['cpu_ms'] / slow['cpu_ms']:.0%}"
+
+    result = {"config": vars(args), "orjson": serialization.orjson is not None, "serialize": rows}
+    report.print_table("serialize", rows)
+    print(f"\norjson: {'yes' if result['orjson'] else 'no (json module fallback)'}")
+    if args.compare:
+        report.compare(args.compare, result, "serialize", ["cpu_ms", "wall_ms"])
+    if args.output:
+        report.save(args.output, result)
+
+
+if __name__ == "__main__":
+    main()
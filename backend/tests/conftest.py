@@ -0,0 +1,77 @@
+"""
+Test settings: a throwaway SQLite database per session and no shared files in
+the working directory. Set before any app module reads `settings`.
+"""
+import os
+import tempfile
+
+_workdir = tempfile.mkdtemp(prefix="medbrief-tests-")
+os.environ["DATABASE_URL"] = f"sqlite+aiosqlite:///{_workdir}/test.db"
+os.environ["PUBMED_SHARED_CACHE_PATH"] = ""
+os.environ["NCBI_RATE_LIMIT_PATH"] = ""
+os.environ["SQL_ECHO"] = "false"
+os.environ["BCRYPT_ROUNDS"] = "4"
+
+# App modules read settings on import, so they come after the environment above
+import itertools  # noqa: E402
+import uuid  # noqa: E402
+from datetime import timedelta  # noqa: E402
+
+import httpx  # noqa: E402
+import pytest  # noqa: E402
+
+from app.database import async_session, engine  # noqa: E402
+from app.models import Journal, JournalSync  # noqa: E402
+from app.services.clock import utc_now  # noqa: E402
+from tests.support import WINDOW, store_articles  # noqa: E402
+
+_issns = itertools.count(1000)
+_pmids = itertools.count(41_000_000, 100)
+
+
+@pytest.fixture
+async def client():
+    from main import app, lifespan
+
+    async with lifespan(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://test") as c:
+            yield c
+    # Pooled connections belong to this test's event loop
+    await engine.dispose()
+
+
+@pytest.fixture
+async def auth_headers(client) -> dict:
+    response = await client.post(
+        "/auth/register", json={"email": f"{uuid.uuid4().hex}@example.com", "password": "pw"},
+    )
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture
+async def brief_profile(client, auth_headers):
+    """(profile id, journal id, stored PMIDs oldest first): five articles in WINDOW, already synced."""
+    issn = f"9999-{next(_issns)}"
+    async with async_session() as db:
+        journal = Journal(name=f"Journal {issn}", issn=issn)
+        db.add(journal)
+        # Covers WINDOW and is fresh, so briefs make no PubMed calls
+        db.add(JournalSync(
+            issn=issn,
+            synced_from=WINDOW[0] - timedelta(days=30),
+            synced_through=WINDOW[1] + timedelta(days=30),
+            synced_at=utc_now(),
+        ))
+        await db.commit()
+        journal_id = journal.id
+
+    first = next(_pmids)
+    pmids = list(range(first, first + 5))
+    for day, pmid in enumerate(pmids):
+        await store_articles(journal_id, [pmid], WINDOW[0] + timedelta(days=day))
+
+    response = await client.post(
+        "/api/profiles/", json={"name": "Brief", "journal_ids": [journal_id]}, headers=auth_headers,
+    )
+    return response.json()["id"], journal_id, pmids
@@ -0,0 +1,34 @@
+"""Helpers shared by the API tests."""
+from datetime import date
+from typing import Iterable
+
+from app.database import async_session
+from app.services.article_store import article_row, upsert_articles
+from app.services.clock import utc_now
+from app.services.records import ArticleRecord
+
+# Brief window the brief_profile fixture's articles fall in
+WINDOW = (date(2025, 1, 1), date(2025, 1, 10))
+
+
+def brief_params(profile_id: int, **extra) -> dict:
+    """Query parameters for a brief over WINDOW."""
+    return {
+        "profile_id": profile_id,
+        "from_date": WINDOW[0].isoformat(),
+        "to_date": WINDOW[1].isoformat(),
+        **extra,
+    }
+
+
+async def store_articles(journal_id: int, pmids: Iterable[int], published_on: date) -> None:
+    """Store articles for one journal, as a sync would."""
+    pmids = list(pmids)
+    async with async_session() as db:
+        await upsert_articles(
+            db,
+            [article_row(ArticleRecord(str(p), f"Article {p}", authors=["A Author"]), published_on, utc_now())
+             for p in pmids],
+            [{"journal_id": journal_id, "article_pmid": p} for p in pmids],
+        )
+        await db.commit()
@@ -0,0 +1,56 @@
+import pytest
+
+from tests.support import WINDOW, brief_params, store_articles
+
+
+async def test_repeat_request_revalidates_with_304(client, auth_headers, brief_profile):
+    profile_id, _, _ = brief_profile
+    first = await client.get("/api/briefs/generate", params=brief_params(profile_id), headers=auth_headers)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+
+    repeat = await client.get(
+        "/api/briefs/generate", params=brief_params(profile_id), headers={**auth_headers, "If-None-Match": etag},
+    )
+    assert repeat.status_code == 304
+    assert repeat.content == b""
+    assert repeat.headers["ETag"] == etag
+
+
+async def test_new_article_changes_etag(client, auth_headers, brief_profile):
+    profile_id, journal_id, pmids = brief_profile
+    first = await client.get("/api/briefs/generate", params=brief_params(profile_id), headers=auth_headers)
+
+    await store_articles(journal_id, [pmids[-1] + 100], WINDOW[1])
+    again = await client.get(
+        "/api/briefs/generate", params=brief_params(profile_id),
+        headers={**auth_headers, "If-None-Match": first.headers["ETag"]},
+    )
+    assert again.status_code == 200
+    assert again.headers["ETag"] != first.headers["ETag"]
+    assert len(again.json()) == len(pmids) + 1
+
+
+async def test_since_returns_only_newer_articles(client, auth_headers, brief_profile):
+    profile_id, journal_id, pmids = brief_profile
+    first = await client.get("/api/briefs/generate", params=brief_params(profile_id), headers=auth_headers)
+    mark = first.headers["X-Brief-Mark"]
+
+    newer = [pmids[-1] + 100, pmids[-1] + 200]
+    await store_articles(journal_id, newer, WINDOW[1])
+    delta = await client.get("/api/briefs/generate", params=brief_params(profile_id, since=mark), headers=auth_headers)
+    assert delta.status_code == 200
+    assert sorted(int(a["pmid"]) for a in delta.json()) == newer
+
+    # A bare PMID works as a mark too
+    middle = await client.get(
+        "/api/briefs/generate", params=brief_params(profile_id, since=str(pmids[2])), headers=auth_headers,
+    )
+    assert sorted(int(a["pmid"]) for a in middle.json()) == pmids[3:] + newer
+
+
+@pytest.mark.parametrize("since", ["abc", "123.not-a-date", "1.2025-13-01", ".2025-01-01"])
+async def test_malformed_since_is_rejected(client, auth_headers, brief_profile, since):
+    profile_id, _, _ = brief_profile
+    response = await client.get("/api/briefs/generate", params=brief_params(profile_id, since=since), headers=auth_headers)
+    assert response.status_code == 400
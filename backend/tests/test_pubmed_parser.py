@@ -0,0 +1,51 @@
+"""
+The EFetch parser must keep producing what the original whole-document parser
+did. efetch_baseline.json holds that parser's output for each fixture (the
+_parse_pubmed_xml that preceded the streaming parser, run on the files as-is).
+"""
+import json
+from pathlib import Path
+
+import pytest
+
+from app.services.pubmed import PubMedStreamParser, _parse_pubmed_xml
+
+FIXTURES = Path(__file__).parent / "fixtures"
+BASELINE = json.loads((FIXTURES / "efetch_baseline.json").read_text(encoding="utf-8"))
+
+
+def _as_baseline_dict(record) -> dict:
+    return {
+        **record.to_dict(),
+        "issns": list(record.issns),
+        "journal_abbrev": record.journal_abbrev,
+        "epub_date": record.epub_date,
+    }
+
+
+@pytest.mark.parametrize("name", sorted(BASELINE))
+def test_whole_document_matches_baseline(name):
+    xml_text = (FIXTURES / name).read_text(encoding="utf-8")
+    assert [_as_baseline_dict(r) for r in _parse_pubmed_xml(xml_text)] == BASELINE[name]
+
+
+@pytest.mark.parametrize("chunk_size", [7, 64, 4096])
+@pytest.mark.parametrize("name", sorted(BASELINE))
+def test_stream_matches_baseline(name, chunk_size):
+    data = (FIXTURES / name).read_bytes()
+    parser = PubMedStreamParser()
+    records = []
+    # Small chunks split tags, entities and multi-byte characters across feeds
+    for start in range(0, len(data), chunk_size):
+        records.extend(parser.feed(data[start:start + chunk_size]))
+    records.extend(parser.close())
+    assert [_as_baseline_dict(r) for r in records] == BASELINE[name]
+
+
+def test_fixtures_cover_the_edge_cases():
+    by_pmid = {a["pmid"]: a for articles in BASELINE.values() for a in articles}
+    assert "20301295" not in by_pmid  # PubmedBookArticle records are skipped
+    assert by_pmid["39045678"]["pub_date"] == ""  # MedlineDate only
+    assert by_pmid["39034567"]["pub_date"] == ""  # No PubDate
+    assert "INTRODUCCIÓN:" in by_pmid["39023456"]["abstract"]  # OtherAbstract appended
+    assert by_pmid["39012345"]["title"] == "Efficacy of "  # Text after inline markup is dropped
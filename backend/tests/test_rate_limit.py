@@ -0,0 +1,36 @@
+import asyncio
+import time
+
+from app.services.rate_limit import SharedRateLimiter
+
+
+async def test_limiters_sharing_a_file_stay_within_the_rate(tmp_path):
+    rate = 20.0
+    path = str(tmp_path / "rate.db")
+    # Separate instances (and SQLite connections), as in two worker processes
+    first = SharedRateLimiter(path, rate=rate, key="ncbi")
+    second = SharedRateLimiter(path, rate=rate, key="ncbi")
+    granted = []
+
+    async def take(limiter):
+        await limiter.acquire()
+        granted.append(time.monotonic())
+
+    started = time.monotonic()
+    await asyncio.gather(*[take(limiter) for _ in range(8) for limiter in (first, second)])
+
+    granted.sort()
+    assert len(granted) == 16
+    assert first.errors == second.errors == 0
+    # Slots are 1/rate apart across both instances: by any moment t, at most
+    # (t - started) * rate + 1 acquisitions can have been granted
+    for count, granted_at in enumerate(granted, start=1):
+        assert count <= (granted_at - started) * rate * 1.05 + 1
+
+
+async def test_unusable_file_falls_back_to_a_per_process_bucket(tmp_path):
+    limiter = SharedRateLimiter(str(tmp_path / "missing" / "rate.db"), rate=100.0)
+    await limiter.acquire()
+    await limiter.acquire()
+    assert limiter.errors == 2
+    assert limiter.acquired == 2
@@ -0,0 +1,51 @@
+import base64
+
+import pytest
+
+from app.database import async_session
+from app.services.records import ArticleRecord
+from app.services.snapshots import SnapshotStore, decode_cursor, encode_cursor
+from tests.support import brief_params
+
+
+async def test_cursor_from_one_store_resolves_from_another(client):
+    articles = [ArticleRecord(str(pmid), f"Article {pmid}", authors=["A Author"]) for pmid in (1, 2, 3)]
+    # Each store has its own in-memory cache, as each worker process does
+    creating, serving = SnapshotStore(), SnapshotStore()
+    async with async_session() as db:
+        snapshot_id = await creating.create(db, 7, articles, True)
+
+    cursor = encode_cursor(snapshot_id, 2)
+    async with async_session() as db:
+        decoded_id, offset = decode_cursor(cursor)
+        snapshot = await serving.get(db, decoded_id, 7)
+        assert snapshot is not None
+        assert snapshot.truncated is True
+        assert [a.pmid for a in snapshot.articles[offset:]] == ["3"]
+        assert await serving.get(db, decoded_id, 8) is None  # Another user's snapshot
+        assert await serving.get(db, "unknown", 7) is None
+
+
+async def test_cursor_pages_follow_the_snapshot(client, auth_headers, brief_profile):
+    profile_id, _, pmids = brief_profile
+    first = await client.get("/api/briefs/generate", params=brief_params(profile_id, limit=3), headers=auth_headers)
+    assert first.status_code == 200
+    assert first.headers["X-Brief-Total"] == "5"
+
+    second = await client.get(
+        "/api/briefs/generate", params={"cursor": first.headers["X-Next-Cursor"]}, headers=auth_headers,
+    )
+    assert second.status_code == 200
+    assert [a["pmid"] for a in first.json() + second.json()] == [str(p) for p in reversed(pmids)]
+    assert "X-Next-Cursor" not in second.headers
+
+
+@pytest.mark.parametrize("offset", ["-1", "abc", "9" * 30, "99999999", "1_0", " 1"])
+async def test_invalid_cursor_offsets_are_rejected(client, auth_headers, brief_profile, offset):
+    profile_id, _, _ = brief_profile
+    first = await client.get("/api/briefs/generate", params=brief_params(profile_id, limit=2), headers=auth_headers)
+    snapshot_id, _ = decode_cursor(first.headers["X-Next-Cursor"])
+
+    cursor = base64.urlsafe_b64encode(f"{snapshot_id}:{offset}".encode()).decode().rstrip("=")
+    response = await client.get("/api/briefs/generate", params={"cursor": cursor}, headers=auth_headers)
+    assert response.status_code == 400
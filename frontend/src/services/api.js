@@ -74,6 +74,52 @@ export async function generateBrief(profileId, { days = 7, fromDate = null, toDa
     return request(url)
 }
 
+/**
+ * Stream a brief as NDJSON, calling onArticles with each batch as it arrives.
+ * Resolves with the final summary ({ total, truncated, partial }).
+ */
+export async function streamBrief(profileId, { days = 7, fromDate = null, toDate = null } = {}, onArticles) {
+    const authStore = useAuthStore()
+
+    let url = `/api/briefs/generate/stream?profile_id=${profileId}`
+    if (fromDate && toDate) {
+        url += `&from_date=${fromDate}&to_date=${toDate}`
+    } else {
+        url += `&days=${days}`
+    }
+
+    const response = await fetch(`${BASE_URL}${url}`, { headers: authStore.getAuthHeaders() })
+    if (!response.ok) {
+        const error = await response.json().catch(() => ({ detail: 'Request failed' }))
+        throw new Error(error.detail || `HTTP ${response.status}`)
+    }
+
+    const reader = response.body.getReader()
+    const decoder = new TextDecoder()
+    let buffer = ''
+    let summary = null
+
+    while (true) {
+        const { done, value } = await reader.read()
+        if (done) break
+        buffer += decoder.decode(value, { stream: true })
+
+        const lines = buffer.split('\n')
+        buffer = lines.pop()
+        for (const line of lines) {
+            if (!line.trim()) continue
+            const event = JSON.parse(line)
+            if (event.type === 'articles') {
+                onArticles(event.articles)
+            } else if (event.type === 'summary') {
+                summary = event
+            }
+        }
+    }
+
+    return summary
+}
+
 /**
  * Update a profile
  */